@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Release-date micro-benchmark
+----------------------------
+Times the cutoff check get_recent_episodes runs on every episode: the
+old strptime-based comparison against release_date_key and an ISO
+string cutoff. The episodes are a synthetic back catalog with a mix of
+day, month and year precision dates.
+
+Usage:
+    python bench/bench_release_dates.py [options]
+
+Options:
+    --episodes N        Episodes in the synthetic catalog (default: 100000)
+    --repeat N          Timing runs per variant; the best is reported (default: 5)
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import queue_podcasts  # noqa: E402
+
+
+def make_catalog(count, seed=1):
+    """Release dates, newest first, roughly 2% month and 1% year precision."""
+    rng = random.Random(seed)
+    day = datetime(2026, 1, 1)
+    dates = []
+    for _ in range(count):
+        day -= timedelta(days=rng.choice((0, 1, 1, 2)))
+        roll = rng.random()
+        if roll < 0.01:
+            dates.append(day.strftime("%Y"))
+        elif roll < 0.03:
+            dates.append(day.strftime("%Y-%m"))
+        else:
+            dates.append(day.strftime("%Y-%m-%d"))
+    return dates
+
+
+def strptime_filter(dates, days, now):
+    """The previous implementation: parse every date, drop what fails."""
+    cutoff = now - timedelta(days=days)
+    kept = []
+    for release_date in dates:
+        try:
+            if len(release_date) == 10:
+                ep_date = datetime.strptime(release_date, "%Y-%m-%d")
+            else:
+                ep_date = datetime.strptime(release_date, "%Y")
+        except ValueError:
+            continue
+        if ep_date >= cutoff:
+            kept.append(release_date)
+    return kept
+
+
+def key_filter(dates, days, now):
+    """release_date_key plus an ISO string cutoff."""
+    cutoff = queue_podcasts.release_cutoff(days, now)
+    kept = []
+    for release_date in dates:
+        try:
+            ep_date = queue_podcasts.release_date_key(release_date)
+        except ValueError:
+            continue
+        if ep_date >= cutoff:
+            kept.append(release_date)
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark release-date cutoff checks")
+    parser.add_argument("--episodes", type=int, default=100000, help="Catalog size (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per variant (default: 5)")
+    args = parser.parse_args()
+
+    dates = make_catalog(args.episodes)
+    # Scan the whole catalog, the worst case for a large back catalog
+    now, days = datetime(2026, 1, 1, 12), 365 * 400
+
+    old = strptime_filter(dates, days, now)
+    new = key_filter(dates, days, now)
+    print(f"{len(dates)} episodes: strptime kept {len(old)}, release_date_key kept {len(new)} "
+          f"({len(new) - len(old)} month-precision dates no longer dropped)")
+
+    print(f"{'variant':<20} {'best ms':>9} {'ns/episode':>11}")
+    for name, func in (("strptime", strptime_filter), ("release_date_key", key_filter)):
+        best = min(timeit.repeat(lambda: func(dates, days, now), number=1, repeat=args.repeat))
+        print(f"{name:<20} {best * 1000:>9.1f} {best * 1e9 / len(dates):>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for queue_podcasts.py
+---------------------------------------
+Measures what a scheduled run pays before its first API request, each
+in a fresh interpreter:
+
+  import        `python -X importtime -c "import queue_podcasts"`, with
+                the heaviest direct imports
+  --help        wall time of `python queue_podcasts.py --help`
+  cached token  import, create the client and authenticate from a cached
+                token, as a cron run does; also reports which of the
+                lazily imported modules got loaded (ideally none)
+
+Usage:
+    python bench/bench_startup.py [options]
+
+Options:
+    --runs N            Runs per measurement; medians are reported (default: 10)
+    --top N             Direct imports to list (default: 8)
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules queue_podcasts imports only when a feature needs them
+LAZY_MODULES = ("requests", "asyncio", "http.server", "webbrowser", "base64", "concurrent.futures", "httpx")
+
+CACHED_TOKEN_RUN = """
+import sys, time
+from pathlib import Path
+import queue_podcasts
+queue_podcasts.SPOTIFY_CLIENT_ID = "bench-client"
+queue_podcasts.SPOTIFY_CLIENT_SECRET = "bench-secret"
+state = Path(sys.argv[1]) / "state.db"
+queue_podcasts.StateStore(state, import_legacy=False).save_token("token", "refresh", time.time() + 3600)
+spotify = queue_podcasts.SpotifyDailyPodcasts(state_path=state)
+assert spotify.ensure_authenticated(interactive=False)
+print(",".join(name for name in sys.argv[2].split(",") if name in sys.modules))
+"""
+
+
+def run_python(args, **kwargs):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True, **kwargs
+    )
+
+
+def import_times():
+    """Cumulative import time of queue_podcasts and its direct imports, in µs."""
+    stderr = run_python(["-X", "importtime", "-c", "import queue_podcasts"]).stderr
+    total, direct = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            # Imports are listed before their parent, so a finished
+            # top-level import means its children weren't ours
+            if name.strip() == "queue_podcasts":
+                total = int(cumulative)
+                break
+            direct = {}
+        elif depth == 1:
+            direct[name.strip()] = int(cumulative)
+    return total, direct
+
+
+def wall_time(args):
+    start = time.perf_counter()
+    run_python(args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark queue_podcasts.py startup")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per measurement (default: 10)")
+    parser.add_argument("--top", type=int, default=8, help="Direct imports to list (default: 8)")
+    args = parser.parse_args()
+
+    totals, direct = [], {}
+    for _ in range(args.runs):
+        total, imports = import_times()
+        totals.append(total)
+        for name, micros in imports.items():
+            direct.setdefault(name, []).append(micros)
+
+    baseline = statistics.median(wall_time(["-c", "pass"]) for _ in range(args.runs))
+    help_time = statistics.median(wall_time(["queue_podcasts.py", "--help"]) for _ in range(args.runs))
+    with tempfile.TemporaryDirectory() as state_dir:
+        cached = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            loaded = run_python(["-c", CACHED_TOKEN_RUN, state_dir, ",".join(LAZY_MODULES)]).stdout.strip()
+            cached.append(time.perf_counter() - start)
+
+    print(f"{'measurement':<28} {'median ms':>10}")
+    print("-" * 39)
+    print(f"{'import queue_podcasts':<28} {statistics.median(totals) / 1000:>10.1f}")
+    print(f"{'--help (wall)':<28} {help_time * 1000:>10.1f}")
+    print(f"{'cached-token auth (wall)':<28} {statistics.median(cached) * 1000:>10.1f}")
+    print(f"{'bare interpreter (wall)':<28} {baseline * 1000:>10.1f}")
+
+    print("\nHeaviest direct imports (median ms, cumulative):")
+    heaviest = sorted(direct.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, micros in heaviest[:args.top]:
+        print(f"  {name:<26} {statistics.median(micros) / 1000:>10.1f}")
+
+    print(f"\nLazy modules loaded by a cached-token start: {loaded or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for queue_podcasts.py
+--------------------------------
+Runs the real SpotifyDailyPodcasts.update_daily_playlist against the fake
+Spotify API in mock_spotify.py and reports wall time, request count and
+bytes moved for each scenario. Nothing touches the network or your real
+token and cache files.
+
+Each scenario runs twice: "cold" with empty caches and a fresh playlist,
+then "warm" the way a later cron run would see it (caches on disk, but
+old enough that every show has to be revalidated).
+
+Usage:
+    python bench/bench_update.py [options]
+
+Options:
+    --latency MS        Delay added to every fake API request (default: 20)
+    --rate-limit N      Answer every Nth request with a 429 (default: off)
+    --workers N         Worker count passed to the updater (default: 8)
+    --async             Use the asyncio engine instead of worker threads
+    --fast              Run updates with fast=True (warm runs exit after the
+                        change-detection probes)
+    --scenario NAME     Only run scenarios whose name contains NAME
+    --json              Print results as JSON instead of a table
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+import queue_podcasts  # noqa: E402
+from mock_spotify import FakeSpotify  # noqa: E402
+
+# name, shows, episodes per show per day, --days, existing playlist size, keep_old
+SCENARIOS = [
+    ("10 shows", 10, 1, 1, 0, False),
+    ("100 shows", 100, 1, 1, 0, False),
+    ("500 shows", 500, 1, 1, 0, False),
+    ("100 shows, 7 days, 3/day", 100, 3, 7, 0, False),
+    ("1k-track playlist, keep-old", 10, 1, 1, 1000, True),
+    ("1k-track playlist, replace", 10, 1, 1, 1000, False),
+]
+
+
+def configure(fake, state_dir):
+    """Point the updater at the fake API and a throwaway state directory."""
+    queue_podcasts.SPOTIFY_CLIENT_ID = "bench-client"
+    queue_podcasts.SPOTIFY_CLIENT_SECRET = "bench-secret"
+    queue_podcasts.API_BASE = fake.api_base
+    queue_podcasts.TOKEN_URL = fake.token_url
+    queue_podcasts.PLAYLIST_COVER_IMAGE = str(BENCH_DIR.parent / "cover.jpg")
+    for name in dir(queue_podcasts):
+        value = getattr(queue_podcasts, name)
+        if name.endswith(("_CACHE", "_DB")) and isinstance(value, Path):
+            setattr(queue_podcasts, name, Path(state_dir) / value.name)
+
+
+def make_client(workers, use_async=False):
+    spotify = queue_podcasts.SpotifyDailyPodcasts(
+        playlist_name="Bench Pods",
+        pool_size=max(queue_podcasts.HTTP_POOL_SIZE, workers)
+    )
+    spotify.use_async = use_async
+    spotify.access_token = "bench-token"
+    spotify.token_expiry = time.time() + 3600
+    return spotify
+
+
+def timed_run(fake, podcasts, days, keep_old, workers, use_async, fast):
+    """Run one update in a fresh client and return its measurements."""
+    fake.reset_stats()
+    spotify = make_client(workers, use_async)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok = spotify.update_daily_playlist(
+                days=days, keep_old=keep_old, workers=workers, podcasts=podcasts, fast=fast
+            )
+        elapsed = time.perf_counter() - start
+    finally:
+        spotify.close_async()
+    return dict(
+        fake.stats(),
+        ok=ok,
+        seconds=round(elapsed, 3),
+        phases=spotify.metrics.summary()["phases"],
+        endpoints=dict(fake.endpoints)
+    )
+
+
+def run_scenario(scenario, latency, rate_limit, workers, use_async=False, fast=False):
+    name, shows, per_day, days, playlist_size, keep_old = scenario
+    fake = FakeSpotify(latency=latency, rate_limit_every=rate_limit).start()
+    try:
+        with tempfile.TemporaryDirectory() as state_dir:
+            configure(fake, state_dir)
+            podcasts = []
+            for i in range(shows):
+                show_id = f"benchshow{i:05d}"
+                fake.add_show(show_id, episodes_per_day=per_day, days=max(days, 1) + 7)
+                podcasts.append({"name": f"Show {i}", "show_id": show_id})
+
+            if playlist_size:
+                archive = fake.add_show("bencharchive", episodes_per_day=1, days=playlist_size)
+                fake.add_playlist("Bench Pods", [ep["uri"] for ep in archive["episodes"]])
+
+            cold = timed_run(fake, podcasts, days, keep_old, workers, use_async, fast)
+            # Expire the episode cache so the warm run revalidates every show
+            ttl = queue_podcasts.EPISODE_CACHE_TTL
+            queue_podcasts.EPISODE_CACHE_TTL = 0
+            try:
+                warm = timed_run(fake, podcasts, days, keep_old, workers, use_async, fast)
+            finally:
+                queue_podcasts.EPISODE_CACHE_TTL = ttl
+    finally:
+        fake.stop()
+    return {"scenario": name, "cold": cold, "warm": warm}
+
+
+def print_table(results):
+    header = f"{'scenario':<30} {'run':<5} {'seconds':>8} {'requests':>9} {'429s':>5} {'KB sent':>8} {'KB recv':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        for run in ("cold", "warm"):
+            stats = result[run]
+            flag = "" if stats["ok"] else "  (failed)"
+            print(f"{result['scenario'] if run == 'cold' else '':<30} {run:<5} "
+                  f"{stats['seconds']:>8.3f} {stats['requests']:>9} {stats['rate_limited']:>5} "
+                  f"{stats['bytes_in'] / 1024:>8.1f} {stats['bytes_out'] / 1024:>8.1f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark queue_podcasts.py against a fake Spotify API")
+    parser.add_argument("--latency", type=float, default=20, help="Per-request latency in ms (default: 20)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Return 429 for every Nth request")
+    parser.add_argument("--workers", type=int, default=8, help="Worker count (default: 8)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Use the asyncio engine instead of worker threads")
+    parser.add_argument("--fast", action="store_true",
+                        help="Run updates in fast mode")
+    parser.add_argument("--scenario", type=str, default="", help="Only run scenarios matching NAME")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if args.scenario.lower() in s[0].lower()]
+    results = [
+        run_scenario(scenario, args.latency / 1000, args.rate_limit, args.workers, args.use_async,
+                     args.fast)
+        for scenario in scenarios
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Fake Spotify Web API for benchmarks
+-----------------------------------
+A small threaded HTTP server that implements the parts of the Spotify
+Web API used by queue_podcasts.py: shows and their episodes, the user's
+playlists, playlist items and the token endpoint.
+
+Each request can be delayed by a fixed latency, every Nth request can be
+answered with a 429, and the server counts requests and bytes in both
+directions so benchmarks can report how much traffic a run generated.
+
+Usage:
+    fake = FakeSpotify(latency=0.02)
+    fake.add_show("show1", episodes_per_day=2)
+    fake.start()
+    ...  # point API_BASE / TOKEN_URL at fake.api_base / fake.token_url
+    fake.stop()
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+def parse_fields(spec):
+    """Parse a Spotify fields= filter into a nested dict."""
+    tree = {}
+    stack = [tree]
+    name = ""
+    for char in spec + ",":
+        if char in ",()":
+            if name:
+                node = stack[-1]
+                for part in name.split("."):
+                    node = node.setdefault(part, {})
+                name_node = node
+                name = ""
+            if char == "(":
+                stack.append(name_node)
+            elif char == ")":
+                stack.pop()
+        else:
+            name += char.strip()
+    return tree
+
+
+def project(value, tree):
+    """Keep only the fields named in a parse_fields() tree."""
+    if not tree or value is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], sub) for key, sub in tree.items() if key in value}
+    return value
+
+
+class FakeSpotify:
+    """In-memory Spotify account served over HTTP."""
+
+    def __init__(self, latency=0.0, rate_limit_every=0, user_id="bench-user"):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.user_id = user_id
+        self.shows = {}
+        self.episodes = {}
+        self.playlists = {}
+        self.lock = threading.Lock()
+        self.server = None
+        self.reset_stats()
+
+    # -- setup ---------------------------------------------------------------
+
+    def add_show(self, show_id, name=None, episodes_per_day=1, days=30):
+        """Add a show with episodes_per_day episodes for the last N days."""
+        show = {
+            "id": show_id,
+            "uri": f"spotify:show:{show_id}",
+            "name": name or f"Show {show_id}",
+            "publisher": "Benchmark Media",
+            "description": "A show generated for benchmarking. " * 10,
+            "images": [{"url": f"https://i.example/{show_id}/{size}", "height": size, "width": size}
+                       for size in (640, 300, 64)],
+            "episodes": [],
+            "version": 0,
+        }
+        self.shows[show_id] = show
+        today = date.today()
+        for day in range(days):
+            for n in range(episodes_per_day):
+                self._new_episode(show, today - timedelta(days=day), append=True)
+        return show
+
+    def publish(self, show_id, release_date=None):
+        """Publish a new episode on a show, as the newest episode."""
+        show = self.shows[show_id]
+        return self._new_episode(show, release_date or date.today(), append=False)
+
+    def _new_episode(self, show, release_date, append):
+        number = len(show["episodes"]) + 1
+        episode_id = f"{show['id']}e{number:05d}"
+        episode = {
+            "id": episode_id,
+            "uri": f"spotify:episode:{episode_id}",
+            "type": "episode",
+            "name": f"{show['name']} episode {number}",
+            "description": "Episode notes with links and sponsor reads. " * 12,
+            "html_description": "<p>Episode notes with links and sponsor reads.</p>" * 12,
+            "duration_ms": 20 * 60 * 1000 + number,
+            "explicit": False,
+            "release_date": release_date.isoformat(),
+            "release_date_precision": "day",
+            "images": show["images"],
+            "external_urls": {"spotify": f"https://open.spotify.com/episode/{episode_id}"},
+            "languages": ["en"],
+        }
+        self.episodes[episode["uri"]] = (episode, show)
+        if append:
+            show["episodes"].append(episode)
+        else:
+            show["episodes"].insert(0, episode)
+        show["version"] += 1
+        return episode
+
+    def add_playlist(self, name, uris=()):
+        """Create a playlist owned by the user."""
+        playlist_id = f"pl{len(self.playlists) + 1:06d}"
+        self.playlists[playlist_id] = {
+            "id": playlist_id,
+            "name": name,
+            "description": "",
+            "owner": {"id": self.user_id},
+            "items": list(uris),
+            "snapshot": 1,
+            "image": None,
+        }
+        return playlist_id
+
+    def playlist_uris(self, playlist_id):
+        return list(self.playlists[playlist_id]["items"])
+
+    # -- server --------------------------------------------------------------
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def api_base(self):
+        return f"{self.url}/v1"
+
+    @property
+    def token_url(self):
+        return f"{self.url}/api/token"
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body together; avoids delayed-ACK stalls on keep-alive
+            disable_nagle_algorithm = True
+            wbufsize = -1
+
+            def handle_any(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, payload = fake.handle(self.command, self.path, self.headers, body)
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                with fake.lock:
+                    fake.bytes_in += length + len(self.requestline) + len(str(self.headers))
+                    fake.bytes_out += len(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = handle_any
+
+            def log_message(self, format, *args):
+                pass
+
+        # The default listen backlog of 5 drops SYNs when an async client
+        # opens many connections at once, adding 1s retransmit stalls
+        server_class = type("Server", (ThreadingHTTPServer,), {"request_queue_size": 128})
+        self.server = server_class(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def reset_stats(self):
+        self.request_count = 0
+        self.rate_limited = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.endpoints = Counter()
+
+    def stats(self):
+        return {
+            "requests": self.request_count,
+            "rate_limited": self.rate_limited,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+    # -- request handling ----------------------------------------------------
+
+    def handle(self, method, path, headers, body):
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+
+        with self.lock:
+            self.request_count += 1
+            count = self.request_count
+            ids = (self.shows, self.playlists, {self.user_id})
+            route = "/".join("{id}" if any(p in known for known in ids) else p for p in parts)
+            self.endpoints[f"{method} /{route}"] += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.rate_limit_every and count % self.rate_limit_every == 0:
+            with self.lock:
+                self.rate_limited += 1
+            return 429, {"Retry-After": "0"}, {"error": {"status": 429, "message": "API rate limit exceeded"}}
+
+        payload = json.loads(body) if body and body[:1] in (b"{", b"[") else None
+
+        with self.lock:
+            if parts == ["api", "token"]:
+                return 200, {}, {"access_token": "bench-token", "token_type": "Bearer", "expires_in": 3600}
+            if parts[0] != "v1":
+                return 404, {}, None
+            return self.route(method, parts[1:], query, headers, payload)
+
+    def route(self, method, parts, query, headers, payload):
+        if parts == ["me"]:
+            return 200, {}, {"id": self.user_id, "display_name": "Bench User"}
+
+        if parts == ["me", "playlists"]:
+            return 200, {}, self.page(
+                [self.simple_playlist(p) for p in reversed(list(self.playlists.values()))],
+                "me/playlists", query, max_limit=50
+            )
+
+        if len(parts) == 3 and parts[0] == "users" and parts[2] == "playlists" and method == "POST":
+            playlist_id = self.add_playlist(payload["name"])
+            self.playlists[playlist_id]["description"] = payload.get("description", "")
+            return 201, {}, self.full_playlist(self.playlists[playlist_id])
+
+        if parts == ["shows"]:
+            ids = query.get("ids", "").split(",")
+            if len(ids) > 50:
+                return 400, {}, {"error": {"status": 400, "message": "Too many ids requested"}}
+            return 200, {}, {"shows": [self.simple_show(self.shows[i]) if i in self.shows else None
+                                       for i in ids]}
+
+        if len(parts) == 3 and parts[0] == "shows" and parts[2] == "episodes":
+            show = self.shows.get(parts[1])
+            if not show:
+                return 404, {}, {"error": {"status": 404, "message": "Non existing id"}}
+            etag = f'"{show["id"]}-{show["version"]}-{query.get("limit")}-{query.get("offset")}"'
+            if headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, None
+            return 200, {"ETag": etag}, self.page(
+                show["episodes"], f"shows/{show['id']}/episodes", query, max_limit=50
+            )
+
+        if len(parts) >= 2 and parts[0] == "playlists":
+            playlist = self.playlists.get(parts[1])
+            if not playlist:
+                return 404, {}, {"error": {"status": 404, "message": "Not found."}}
+            return self.route_playlist(method, playlist, parts[2:], query, payload)
+
+        return 404, {}, {"error": {"status": 404, "message": "Service not found"}}
+
+    def route_playlist(self, method, playlist, rest, query, payload):
+        fields = parse_fields(query["fields"]) if "fields" in query else None
+
+        if not rest:
+            if method == "GET":
+                return 200, {}, project(self.full_playlist(playlist), fields)
+            if method == "PUT":
+                playlist.update({k: v for k, v in payload.items() if k in ("name", "description")})
+                playlist["snapshot"] += 1
+                return 200, {}, None
+
+        if rest == ["images"] and method == "PUT":
+            playlist["image"] = True
+            return 202, {}, None
+
+        if rest == ["tracks"]:
+            if method == "GET":
+                return 200, {}, project(self.tracks_page(playlist, query), fields)
+            if method == "POST":
+                position = payload.get("position", len(playlist["items"]))
+                playlist["items"][position:position] = payload["uris"]
+            elif method == "DELETE":
+                remove = {track["uri"] for track in payload["tracks"]}
+                playlist["items"] = [uri for uri in playlist["items"] if uri not in remove]
+            elif method == "PUT" and "uris" in payload:
+                playlist["items"] = list(payload["uris"])
+            elif method == "PUT":
+                start = payload["range_start"]
+                length = payload.get("range_length", 1)
+                before = payload["insert_before"]
+                moved = playlist["items"][start:start + length]
+                del playlist["items"][start:start + length]
+                if before > start:
+                    before -= length
+                playlist["items"][before:before] = moved
+            else:
+                return 405, {}, None
+            playlist["snapshot"] += 1
+            return (201 if method == "POST" else 200), {}, {"snapshot_id": self.snapshot_id(playlist)}
+
+        return 404, {}, None
+
+    # -- response builders ---------------------------------------------------
+
+    def page(self, items, path, query, max_limit):
+        limit = min(int(query.get("limit", 20)), max_limit)
+        offset = int(query.get("offset", 0))
+        chunk = items[offset:offset + limit]
+        more = offset + limit < len(items)
+        return {
+            "href": f"{self.api_base if self.server else ''}/{path}?offset={offset}&limit={limit}",
+            "items": chunk,
+            "limit": limit,
+            "offset": offset,
+            "total": len(items),
+            "next": f"{self.api_base}/{path}?offset={offset + limit}&limit={limit}" if more else None,
+            "previous": None,
+        }
+
+    def snapshot_id(self, playlist):
+        return f"{playlist['id']}-snapshot-{playlist['snapshot']}"
+
+    def simple_show(self, show):
+        data = {k: v for k, v in show.items() if k not in ("episodes", "version")}
+        data["total_episodes"] = len(show["episodes"])
+        return data
+
+    def simple_playlist(self, playlist):
+        return {
+            "id": playlist["id"],
+            "name": playlist["name"],
+            "description": playlist["description"],
+            "owner": playlist["owner"],
+            "public": False,
+            "snapshot_id": self.snapshot_id(playlist),
+            "tracks": {"total": len(playlist["items"])},
+        }
+
+    def track_item(self, uri):
+        episode, show = self.episodes[uri]
+        track = dict(episode, show=self.simple_show(show))
+        return {"added_at": "2026-01-01T06:00:00Z", "is_local": False, "track": track}
+
+    def tracks_page(self, playlist, query):
+        page = self.page(playlist["items"], f"playlists/{playlist['id']}/tracks", query, max_limit=100)
+        page["items"] = [self.track_item(uri) for uri in page["items"]]
+        return page
+
+    def full_playlist(self, playlist):
+        data = self.simple_playlist(playlist)
+        data["tracks"] = self.tracks_page(playlist, {"limit": 100})
+        return data
@@ -15,20 +15,51 @@ Options:
     --keep-old      Don't remove old episodes, just add new ones
     --keep-latest   Always include each show's most recent episode,
                     even if it's older than the time window
+    --order ORDER   "shows" (podcast list order, default) or "newest"
+                    (newest first across all shows)
+    --per-show N    Take at most N episodes from each show
+    --max-minutes N Only queue episodes that fit in N minutes in total
     --playlist NAME Custom playlist name (default: "Daily Podcasts")
+    --profile FILE  Update every playlist defined in a JSON profile
+    --tenants FILE  Update several accounts' profiles in one batch, see
+                    README.md
+    --authorize NAME
+                    With --tenants, authorize one tenant's account
+    --daemon        Keep running and update on a schedule instead of once
+    --schedule CRON Cron expression for --daemon (default: "0 6 * * *")
+    --fast          Exit after one or two cheap requests when nothing
+                    changed since the last --fast run
+    --plan          Show what would change (adds, removes, requests)
+                    without writing anything
+    --plan-out FILE Like --plan, also writing the plan as JSON to FILE
+                    ("-" for stdout)
+    --workers N     Fetch up to N shows or playlist pages concurrently
+                    (default: 1)
+    --async         Fetch shows and playlist pages on an asyncio event
+                    loop instead of threads (requires httpx)
+    --metrics-out FILE
+                    Write request and phase timings as JSON, or as a
+                    Prometheus textfile if FILE ends in .prom
 """
 
+import os
+import re
 import sys
 import json
 import time
-import base64
+import heapq
+import hashlib
+import sqlite3
 import argparse
-import webbrowser
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlencode, parse_qs, urlparse
-import requests
+
+# requests, asyncio, http.server, webbrowser, base64 and concurrent.futures
+# are imported where they're used, so a cron run with a cached token starts
+# without loading what it doesn't need (see bench/bench_startup.py)
 
 # =============================================================================
 # CONFIGURATION - Edit these values
@@ -66,51 +97,920 @@ PODCASTS = [
 
 REDIRECT_URI = "http://127.0.0.1:8888/callback"
 SCOPES = "playlist-modify-public playlist-modify-private playlist-read-private ugc-image-upload"
+STATE_DB = Path.home() / ".spotify_podcast_state.db"
+RUN_HISTORY_LIMIT = 1000                   # Keep this many runs in the state database
+WRITE_JOURNAL_MAX_AGE = 24 * 3600          # Resume interrupted playlist writes for this long
+# JSON caches from older versions, imported into STATE_DB on first run
 TOKEN_CACHE = Path.home() / ".spotify_podcast_token.json"
 PLAYLIST_CACHE = Path.home() / ".spotify_podcast_playlist.json"
+EPISODE_CACHE = Path.home() / ".spotify_podcast_episodes.json"
+COVER_CACHE = Path.home() / ".spotify_podcast_cover.json"
+EPISODE_CACHE_TTL = 10 * 60                # Reuse a show's episodes without asking for this long
+EPISODE_CACHE_MAX_AGE = 7 * 24 * 60 * 60   # Forget shows not fetched for this long
+EPISODE_COUNT_MAX_AGE = 60 * 60            # Trust an unchanged episode count this long after a fetch
+EPISODE_FIRST_PAGE = 10                    # Episodes in the first (cached) page per show
+EPISODE_PAGE_SIZE = 50                     # Episodes per page when paging further back
+API_BASE = "https://api.spotify.com/v1"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+# HTTP connection pooling and retry behaviour
+HTTP_POOL_SIZE = 10            # Keep-alive connections per host
+HTTP_TIMEOUT = (5, 30)         # (connect, read) timeout in seconds
+HTTP_MAX_RETRIES = 3           # Retries on 429/5xx and connection errors
+HTTP_BACKOFF = 1.0             # Initial backoff in seconds, doubled per retry
+HTTP_MAX_RETRY_WAIT = 60       # Give up instead of waiting longer than this
+RATE_LIMIT = None              # Sustained requests per second, either engine (None: no cap)
+RATE_LIMIT_BURST = 50          # Requests allowed back to back before throttling
+
+# Async engine (--async)
+ASYNC_CONCURRENCY = 16          # Requests in flight at once
+
+# Episode selection
+EPISODE_ORDERS = ("shows", "newest")  # PODCASTS order, or newest first across shows
+
+# Batch mode (--tenants)
+TENANT_CONCURRENCY = 4          # Tenants updated at the same time
+
+# Daemon mode
+DEFAULT_SCHEDULE = "0 6 * * *"  # Cron expression used when none is given
+TOKEN_REFRESH_MARGIN = 5 * 60   # Refresh the access token this long before it expires
+TOKEN_REFRESH_TIMEOUT = (5, 10) # (connect, read) timeout for token refreshes, never retried
+TOKEN_REFRESH_LEASE = 30        # Other runs wait this long for a refresh before taking over
+
+
+def oauth_callback_server(port=8888):
+    """Create the local HTTP server that receives Spotify's OAuth redirect.
+
+    http.server is only needed for interactive authorization, so it's
+    imported here rather than on every run.
+    """
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    
+    class OAuthCallbackHandler(BaseHTTPRequestHandler):
+        """Handle OAuth callback from Spotify."""
+        
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            if "code" in query:
+                self.server.auth_code = query["code"][0]
+                self.send_response(200)
+                self.send_header("Content-type", "text/html")
+                self.end_headers()
+                self.wfile.write(b"""
+                    <html><body style="font-family: -apple-system, BlinkMacSystemFont, sans-serif; 
+                        display: flex; justify-content: center; align-items: center; height: 100vh;
+                        background: linear-gradient(135deg, #1DB954, #191414);">
+                        <div style="text-align: center; color: white;">
+                            <h1>&#127911; Success!</h1>
+                            <p>You can close this window and return to the terminal.</p>
+                        </div>
+                    </body></html>
+                """)
+            else:
+                self.server.auth_code = None
+                self.send_response(400)
+                self.end_headers()
+        
+        def log_message(self, format, *args):
+            pass  # Suppress HTTP logs
+    
+    server = HTTPServer(("localhost", port), OAuthCallbackHandler)
+    server.auth_code = None
+    return server
+
+
+class RunMetrics:
+    """Collects request and phase timings for one run.
+
+    Requests are grouped by endpoint, with playlist, show and user IDs
+    replaced by {id}. The summary can be written as JSON or as a
+    Prometheus textfile for node_exporter's textfile collector.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.endpoints = {}
+        self.phases = {}
+    
+    @staticmethod
+    def endpoint_name(method, url):
+        """Normalise a request URL to e.g. 'GET /shows/{id}/episodes'."""
+        path = urlparse(url).path
+        if url.startswith(API_BASE):
+            path = urlparse(url[len(API_BASE):]).path
+        path = re.sub(r"/(playlists|shows|users)/[^/]+", r"/\1/{id}", path)
+        return f"{method} {path}"
+    
+    def record_request(self, method, url, status, seconds, size, retries):
+        """Record one request, including any retries it took."""
+        name = self.endpoint_name(method, url)
+        with self.lock:
+            stats = self.endpoints.setdefault(name, {
+                "count": 0,
+                "seconds": 0.0,
+                "max_seconds": 0.0,
+                "bytes": 0,
+                "retries": 0,
+                "statuses": {}
+            })
+            stats["count"] += 1
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["bytes"] += size
+            stats["retries"] += retries
+            stats["statuses"][str(status)] = stats["statuses"].get(str(status), 0) + 1
+    
+    @contextmanager
+    def phase(self, name):
+        """Time a block of work; repeated phases add up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+    
+    def summary(self):
+        """Return the collected metrics as a JSON-serialisable dict."""
+        with self.lock:
+            endpoints = {
+                name: dict(stats, seconds=round(stats["seconds"], 4),
+                           max_seconds=round(stats["max_seconds"], 4),
+                           statuses=dict(stats["statuses"]))
+                for name, stats in sorted(self.endpoints.items())
+            }
+            return {
+                "started": self.started,
+                "duration_seconds": round(time.time() - self.started, 4),
+                "requests": sum(stats["count"] for stats in endpoints.values()),
+                "retries": sum(stats["retries"] for stats in endpoints.values()),
+                "bytes": sum(stats["bytes"] for stats in endpoints.values()),
+                "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+                "endpoints": endpoints
+            }
+    
+    def to_prometheus(self):
+        """Render the summary in the Prometheus text exposition format."""
+        summary = self.summary()
+        prefix = "spotify_podcasts"
+        lines = [
+            f"# HELP {prefix}_run_duration_seconds Wall time of the last run.",
+            f"# TYPE {prefix}_run_duration_seconds gauge",
+            f"{prefix}_run_duration_seconds {summary['duration_seconds']}",
+            f"# HELP {prefix}_last_run_timestamp_seconds Unix time the last run started.",
+            f"# TYPE {prefix}_last_run_timestamp_seconds gauge",
+            f"{prefix}_last_run_timestamp_seconds {summary['started']:.0f}",
+            f"# HELP {prefix}_phase_duration_seconds Time spent in each phase of the last run.",
+            f"# TYPE {prefix}_phase_duration_seconds gauge",
+        ]
+        for name, seconds in summary["phases"].items():
+            lines.append(f'{prefix}_phase_duration_seconds{{phase="{name}"}} {seconds}')
+        
+        metrics = [
+            # Per-run values, reset every run, so gauges without a _total suffix
+            ("request_duration_seconds", "Summed request latency per endpoint in the last run.", "seconds"),
+            ("request_duration_seconds_max", "Slowest request per endpoint in the last run.", "max_seconds"),
+            ("request_retries", "Retries per endpoint in the last run.", "retries"),
+            ("response_bytes", "Response body bytes per endpoint in the last run.", "bytes"),
+        ]
+        for metric, help_text, key in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            for name, stats in summary["endpoints"].items():
+                lines.append(f'{prefix}_{metric}{{endpoint="{name}"}} {stats[key]}')
+        
+        lines.append(f"# HELP {prefix}_requests Requests per endpoint and final status code in the last run.")
+        lines.append(f"# TYPE {prefix}_requests gauge")
+        for name, stats in summary["endpoints"].items():
+            for status, count in stats["statuses"].items():
+                lines.append(f'{prefix}_requests{{endpoint="{name}",status="{status}"}} {count}')
+        
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path):
+        """Write the metrics to path: Prometheus format for *.prom, else JSON.
+
+        A path of "-" prints the JSON summary instead.
+        """
+        if path == "-":
+            print(json.dumps(self.summary(), indent=2))
+            return
+        
+        content = self.to_prometheus() if path.endswith(".prom") else json.dumps(self.summary(), indent=2)
+        # Write then rename, so scrapers never see a half-written file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+def connect_failed(error):
+    """Whether a requests exception means the request never reached the server.
+
+    True for connect timeouts and failures to open a new connection (DNS,
+    refused), not for connections dropped after the request was sent.
+    """
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+
+class TokenBucket:
+    """Token-bucket rate limiter, shareable between threads and coroutines.
+
+    reserve() takes a token and returns how many seconds the caller must
+    wait before using it, so it works with time.sleep and asyncio.sleep.
+    """
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class ThreadOutput:
+    """A sys.stdout stand-in that can buffer output per thread.
+
+    Inside capture(), everything a thread prints is held back and then
+    written in one block, so concurrent jobs don't interleave their
+    output line by line.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+    
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is not None:
+            buffer.append(text)
+            return len(text)
+        with self.lock:
+            return self.stream.write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    @contextmanager
+    def capture(self):
+        self.local.buffer = []
+        try:
+            yield
+        finally:
+            text = "".join(self.local.buffer)
+            self.local.buffer = None
+            with self.lock:
+                self.stream.write(text)
+                self.stream.flush()
+
+
+class CronSchedule:
+    """A five-field cron expression: minute hour day-of-month month weekday.
+
+    Supports *, lists (1,15), ranges (1-5) and steps (*/15, 8-18/2). As in
+    cron, when both day-of-month and weekday are restricted a time matches
+    if either does. Weekdays run 0-6 from Sunday; 7 is also Sunday.
+    """
+    
+    FIELDS = [("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7)]
+    
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields, got {len(parts)}: {expression!r}")
+        
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self.parse_field(part, *field) for part, field in zip(parts, self.FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+        # Reject dates that never exist (e.g. "0 0 30 2 *") now, not when
+        # the daemon first asks for the next run
+        self.next_after(datetime.now())
+    
+    @staticmethod
+    def parse_field(field, name, lo, hi):
+        values = set()
+        for item in field.split(","):
+            item, _, step = item.partition("/")
+            try:
+                step = int(step) if step else 1
+                if item == "*":
+                    start, end = lo, hi
+                elif "-" in item:
+                    start, end = (int(x) for x in item.split("-", 1))
+                else:
+                    start = int(item)
+                    end = hi if _ else start
+            except ValueError:
+                raise ValueError(f"invalid {name} field: {field!r}") from None
+            if not lo <= start <= end <= hi or step < 1:
+                raise ValueError(f"{name} out of range {lo}-{hi}: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def day_matches(self, when):
+        day = when.day in self.days
+        weekday = (when.weekday() + 1) % 7 in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return weekday
+        if self.any_weekday:
+            return day
+        return day or weekday
+    
+    def next_after(self, when):
+        """Return the first matching minute strictly after `when`."""
+        t = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = when.year + 5
+        while t.year <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self.day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"cron expression never matches: {self.expression!r}")
+
+
+class StateStore:
+    """Tokens, playlist IDs, show episodes, cover hashes and run history.
+
+    Everything lives in one SQLite database in WAL mode, so concurrent runs
+    (parallel cron jobs, the daemon, profiles) read consistent data and
+    every write is an atomic transaction. The connection is shared between
+    threads behind a lock.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS token (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            access_token TEXT,
+            refresh_token TEXT,
+            expiry REAL NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS token_lease (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            holder TEXT NOT NULL,
+            expires REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS playlists (
+            name TEXT PRIMARY KEY,
+            id TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS shows (
+            show_id TEXT PRIMARY KEY,
+            fetched_at REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS covers (
+            playlist_id TEXT PRIMARY KEY,
+            hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started REAL NOT NULL,
+            duration REAL NOT NULL,
+            playlist TEXT NOT NULL,
+            playlist_id TEXT,
+            episodes INTEGER NOT NULL,
+            writes INTEGER,
+            ok INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS fast_path (
+            playlist_id TEXT PRIMARY KEY,
+            snapshot_id TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            shows TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS write_journal (
+            playlist_id TEXT PRIMARY KEY,
+            batches TEXT NOT NULL,
+            done INTEGER NOT NULL,
+            snapshot_id TEXT,
+            updated REAL NOT NULL
+        );
+    """
+    
+    def __init__(self, path=STATE_DB, import_legacy=True):
+        self.path = Path(path)
+        is_new = not self.path.exists()
+        # Holds the refresh token, so create it private: SQLite gives the
+        # -wal and -shm files the database's permissions
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            str(self.path), timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Databases created by earlier versions may have readable WAL files
+        for suffix in ("", "-wal", "-shm"):
+            sidecar = self.path.with_name(self.path.name + suffix)
+            if sidecar.exists() and sidecar.stat().st_mode & 0o077:
+                sidecar.chmod(0o600)
+        with self.transaction() as conn:
+            for statement in self.SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+        
+        if is_new and import_legacy:
+            self.import_legacy_files()
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block as one atomic write transaction."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+    
+    def query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+    
+    def import_legacy_files(self):
+        """Copy state from the JSON cache files used by older versions.
+
+        Imported files are renamed with a .migrated suffix so they aren't
+        picked up again.
+        """
+        def read(path):
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return None
+        
+        token = read(TOKEN_CACHE)
+        if isinstance(token, dict) and token.get("access_token"):
+            self.save_token(token["access_token"], token.get("refresh_token"), token.get("expiry", 0))
+        
+        playlists = read(PLAYLIST_CACHE)
+        if isinstance(playlists, dict):
+            if "playlists" in playlists:
+                self.save_playlists(playlists["playlists"])
+            elif playlists.get("name") and playlists.get("id"):
+                self.save_playlists({playlists["name"]: playlists["id"]})
+        
+        shows = read(EPISODE_CACHE)
+        if isinstance(shows, dict):
+            self.save_shows(shows)
+        
+        covers = read(COVER_CACHE)
+        if isinstance(covers, dict):
+            for playlist_id, image_hash in covers.items():
+                self.save_cover(playlist_id, image_hash)
+        
+        for path in (TOKEN_CACHE, PLAYLIST_CACHE, EPISODE_CACHE, COVER_CACHE):
+            if path.exists():
+                path.rename(path.with_name(path.name + ".migrated"))
+    
+    def claim_token_refresh(self, holder, duration):
+        """Take the token refresh lease for duration seconds.
+
+        Returns False while another holder's lease is still running. The
+        lease is a row rather than an open transaction, so the refresh
+        request itself runs without locking the database.
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute("SELECT holder, expires FROM token_lease WHERE id = 1").fetchone()
+            if row and row[0] != holder and row[1] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO token_lease (id, holder, expires) VALUES (1, ?, ?)",
+                (holder, now + duration)
+            )
+        return True
+    
+    def release_token_refresh(self, holder):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM token_lease WHERE id = 1 AND holder = ?", (holder,))
+    
+    def load_token(self):
+        """Return (access_token, refresh_token, expiry), or None."""
+        rows = self.query("SELECT access_token, refresh_token, expiry FROM token WHERE id = 1")
+        return rows[0] if rows else None
+    
+    def save_token(self, access_token, refresh_token, expiry):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO token (id, access_token, refresh_token, expiry) "
+                "VALUES (1, ?, ?, ?)",
+                (access_token, refresh_token, expiry)
+            )
+    
+    def load_playlists(self):
+        """Return the playlist name -> ID index."""
+        return dict(self.query("SELECT name, id FROM playlists"))
+    
+    def save_playlists(self, names, removed=None):
+        """Add or update index entries and drop removed ones.
+
+        removed maps names to the IDs they were dropped with; an entry
+        another run has since pointed at a different ID is left alone.
+        Only the given rows change, so runs indexing different playlists
+        don't overwrite each other.
+        """
+        with self.transaction() as conn:
+            conn.executemany("DELETE FROM playlists WHERE name = ? AND id = ?", (removed or {}).items())
+            conn.executemany("INSERT OR REPLACE INTO playlists (name, id) VALUES (?, ?)", names.items())
+    
+    def load_shows(self, max_age):
+        """Return cached show entries, evicting any older than max_age seconds."""
+        cutoff = time.time() - max_age
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM shows WHERE fetched_at < ?", (cutoff,))
+            rows = conn.execute("SELECT show_id, data FROM shows").fetchall()
+        return {show_id: json.loads(data) for show_id, data in rows}
+    
+    def save_shows(self, shows):
+        """Store show entries, keeping whichever copy was fetched last."""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO shows (show_id, fetched_at, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (show_id) DO UPDATE SET fetched_at = excluded.fetched_at, "
+                "data = excluded.data WHERE excluded.fetched_at >= shows.fetched_at",
+                [(show_id, entry.get("fetched_at", 0), json.dumps(entry))
+                 for show_id, entry in shows.items()]
+            )
+    
+    def load_cover(self, playlist_id):
+        rows = self.query("SELECT hash FROM covers WHERE playlist_id = ?", (playlist_id,))
+        return rows[0][0] if rows else None
+    
+    def save_cover(self, playlist_id, image_hash):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO covers (playlist_id, hash) VALUES (?, ?)",
+                (playlist_id, image_hash)
+            )
+    
+    def load_fast_path(self, playlist_id):
+        """What a playlist looked like after its last --fast update, or None."""
+        rows = self.query(
+            "SELECT snapshot_id, fingerprint, shows FROM fast_path WHERE playlist_id = ?",
+            (playlist_id,)
+        )
+        if not rows:
+            return None
+        snapshot_id, fingerprint, shows = rows[0]
+        return {"snapshot_id": snapshot_id, "fingerprint": fingerprint, "shows": json.loads(shows)}
+    
+    def save_fast_path(self, playlist_id, snapshot_id, fingerprint, shows):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fast_path (playlist_id, snapshot_id, fingerprint, shows) "
+                "VALUES (?, ?, ?, ?)",
+                (playlist_id, snapshot_id, fingerprint, json.dumps(shows))
+            )
+    
+    def clear_fast_path(self, playlist_id):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM fast_path WHERE playlist_id = ?", (playlist_id,))
+    
+    def start_journal(self, playlist_id, batches, snapshot_id):
+        """Journal a list of playlist write batches before sending them."""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO write_journal (playlist_id, batches, done, snapshot_id, updated) "
+                "VALUES (?, ?, 0, ?, ?)",
+                (playlist_id, json.dumps(batches), snapshot_id, time.time())
+            )
+    
+    def advance_journal(self, playlist_id, done, snapshot_id):
+        """Record that the first `done` batches went through."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE write_journal SET done = ?, snapshot_id = ?, updated = ? WHERE playlist_id = ?",
+                (done, snapshot_id, time.time(), playlist_id)
+            )
+    
+    def load_journal(self, playlist_id, max_age):
+        """Unfinished write batches for a playlist, or None."""
+        rows = self.query(
+            "SELECT batches, done, snapshot_id FROM write_journal "
+            "WHERE playlist_id = ? AND updated >= ?",
+            (playlist_id, time.time() - max_age)
+        )
+        if not rows:
+            return None
+        batches, done, snapshot_id = rows[0]
+        return {"batches": json.loads(batches), "done": done, "snapshot_id": snapshot_id}
+    
+    def clear_journal(self, playlist_id):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM write_journal WHERE playlist_id = ?", (playlist_id,))
+    
+    def record_run(self, started, playlist, playlist_id, episodes, writes, ok):
+        """Append a run to the history, keeping the last RUN_HISTORY_LIMIT."""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO runs (started, duration, playlist, playlist_id, episodes, writes, ok) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (started, time.time() - started, playlist, playlist_id, episodes, writes, int(ok))
+            )
+            conn.execute(
+                "DELETE FROM runs WHERE id <= (SELECT MAX(id) FROM runs) - ?",
+                (RUN_HISTORY_LIMIT,)
+            )
+
+
+def longest_increasing_run(values):
+    """Return the values forming a longest increasing subsequence."""
+    tails = []      # index into values of the smallest tail for each length
+    previous = []   # index of the preceding element in the subsequence
+    for i, value in enumerate(values):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if values[tails[mid]] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        previous.append(tails[lo - 1] if lo else None)
+        if lo == len(tails):
+            tails.append(i)
+        else:
+            tails[lo] = i
+    
+    run = []
+    i = tails[-1] if tails else None
+    while i is not None:
+        run.append(values[i])
+        i = previous[i]
+    return run[::-1]
+
+
+def plan_playlist_sync(current, target):
+    """Compute the edits that turn the current playlist into target.
+
+    Returns a dict of batched operations, applied in this order:
+      remove: lists of URIs to delete (every occurrence, max 100 each)
+      move:   (range_start, insert_before) single-item reorders
+      add:    (position, uris) inserts, max 100 URIs each
+    Returns None when the playlist can't be diffed by URI (unavailable
+    items or duplicated episodes), in which case it should be replaced.
+    """
+    target = list(dict.fromkeys(target))
+    index = {uri: i for i, uri in enumerate(target)}
+    
+    if None in current:
+        return None
+    
+    kept = [uri for uri in current if uri in index]
+    if len(kept) != len(set(kept)):
+        return None
+    
+    stale = list(dict.fromkeys(uri for uri in current if uri not in index))
+    remove = [stale[i:i+100] for i in range(0, len(stale), 100)]
+    
+    # Leave the longest already-ordered run in place and move the rest
+    order = [index[uri] for uri in kept]
+    settled = set(longest_increasing_run(order))
+    move = []
+    for value in sorted(set(order) - settled):
+        start = order.index(value)
+        insert_before = next(
+            (i for i, v in enumerate(order) if v in settled and v > value),
+            len(order)
+        )
+        move.append((start, insert_before))
+        order.pop(start)
+        order.insert(insert_before - 1 if insert_before > start else insert_before, value)
+        settled.add(value)
+    
+    # Insert missing episodes in runs; earlier positions already match
+    add = []
+    present = set(kept)
+    run_start, run = None, []
+    for position, uri in enumerate(target + [None]):
+        if uri is not None and uri not in present:
+            if not run:
+                run_start = position
+            run.append(uri)
+        elif run:
+            for i in range(0, len(run), 100):
+                add.append((run_start + i, run[i:i+100]))
+            run = []
+    
+    return {"remove": remove, "move": move, "add": add}
+
 
+def apply_write_batches(uris, batches):
+    """The playlist's URIs after Spotify applies write batches in order.
 
-class OAuthCallbackHandler(BaseHTTPRequestHandler):
-    """Handle OAuth callback from Spotify."""
-    
-    def do_GET(self):
-        query = parse_qs(urlparse(self.path).query)
-        if "code" in query:
-            self.server.auth_code = query["code"][0]
-            self.send_response(200)
-            self.send_header("Content-type", "text/html")
-            self.end_headers()
-            self.wfile.write(b"""
-                <html><body style="font-family: -apple-system, BlinkMacSystemFont, sans-serif; 
-                    display: flex; justify-content: center; align-items: center; height: 100vh;
-                    background: linear-gradient(135deg, #1DB954, #191414);">
-                    <div style="text-align: center; color: white;">
-                        <h1>&#127911; Success!</h1>
-                        <p>You can close this window and return to the terminal.</p>
-                    </div>
-                </body></html>
-            """)
+    Batches are (method, body) pairs as sent by write_batches. Used to
+    plan against the playlist an interrupted update leaves once its
+    remaining batches are resumed.
+    """
+    uris = list(uris)
+    for method, body in batches:
+        if method == "DELETE":
+            gone = {track["uri"] for track in body["tracks"]}
+            uris = [uri for uri in uris if uri not in gone]
+        elif "range_start" in body:
+            start, insert_before = body["range_start"], body["insert_before"]
+            uri = uris.pop(start)
+            uris.insert(insert_before - 1 if insert_before > start else insert_before, uri)
+        elif method == "PUT":
+            uris = list(body["uris"])
+        elif "position" in body:
+            uris[body["position"]:body["position"]] = body["uris"]
         else:
-            self.server.auth_code = None
-            self.send_response(400)
-            self.end_headers()
+            uris.extend(body["uris"])
+    return uris
+
+
+def episode_entry(episode):
+    """Keep only the episode fields the playlist updater uses."""
+    return {
+        "uri": episode["uri"],
+        "name": episode["name"],
+        "duration_ms": episode["duration_ms"],
+        "release_date": episode["release_date"]
+    }
+
+
+RELEASE_DATE_PATTERN = re.compile(r"\d{4}(-\d{2}){0,2}")
+
+
+def release_date_key(release_date):
+    """Normalise a release date to a sortable "YYYY-MM-DD" string.
+
+    Spotify gives day ("2024-05-17"), month ("2024-05") or year ("2024")
+    precision. Partial dates are padded to the start of the period, so
+    keys compare as strings in date order. Raises ValueError for
+    anything else.
+    """
+    if not release_date or not RELEASE_DATE_PATTERN.fullmatch(release_date):
+        raise ValueError(f"Unrecognised release date: {release_date!r}")
+    return release_date + "-01-01"[len(release_date) - 4:]
+
+
+def release_cutoff(days, now=None):
+    """The earliest release_date_key inside a window of the last N days.
+
+    Release dates have no time of day and count from midnight, so a
+    window starting partway through a day starts at the next one.
+    """
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    if cutoff != cutoff.replace(hour=0, minute=0, second=0, microsecond=0):
+        cutoff += timedelta(days=1)
+    return cutoff.strftime("%Y-%m-%d")
+
+
+def select_episodes(show_episodes, order="shows", per_show=None, max_minutes=None):
+    """Choose the episodes to queue from every show's candidates.
+
+    show_episodes has one list per show, each newest first. With order
+    "shows" the shows keep their order; "newest" merges them by release
+    date with a heap, O(n log k) for n episodes from k shows. Episodes
+    are deduplicated across shows, at most per_show are taken from each
+    show, and with max_minutes any episode that would go over the
+    budget is skipped so shorter ones can still fill it.
+    """
+    tagged = [[(show, episode) for episode in episodes] for show, episodes in enumerate(show_episodes)]
+    if order == "newest":
+        candidates = heapq.merge(
+            *tagged, key=lambda item: release_date_key(item[1]["release_date"]), reverse=True
+        )
+    else:
+        candidates = (item for episodes in tagged for item in episodes)
     
-    def log_message(self, format, *args):
-        pass  # Suppress HTTP logs
+    budget = max_minutes * 60000 if max_minutes else None
+    selected, seen, counts = [], set(), [0] * len(show_episodes)
+    for show, episode in candidates:
+        if episode["uri"] in seen or (per_show and counts[show] >= per_show):
+            continue
+        if budget is not None and episode["duration_ms"] > budget:
+            continue
+        seen.add(episode["uri"])
+        counts[show] += 1
+        selected.append(episode)
+        if budget is not None:
+            budget -= episode["duration_ms"]
+    return selected
+
+
+def plan_write_count(plan):
+    """Number of write requests needed to apply a sync plan."""
+    return len(plan["remove"]) + len(plan["move"]) + len(plan["add"])
+
+
+def replace_write_count(episode_uris):
+    """Number of write requests needed to replace a playlist outright."""
+    return max(1, -(-len(episode_uris) // 100))
+
+
+def choose_sync_plan(current, target):
+    """Decide how sync_playlist should bring current in line with target.
+
+    Returns a plan_playlist_sync plan, or None when the playlist has to
+    be replaced, or when replacing it takes no more requests.
+    """
+    plan = plan_playlist_sync(current, target)
+    if plan is None or plan_write_count(plan) > replace_write_count(target):
+        return None
+    return plan
+
+
+def update_fingerprint(podcasts, days, keep_old, keep_latest, selection):
+    """Hash of everything besides new episodes that decides an update's result.
+
+    Includes today's release-date cutoff, so the first run after the
+    window moves on is never skipped.
+    """
+    key = json.dumps([
+        [podcast["show_id"] for podcast in podcasts],
+        days, keep_old, keep_latest, selection or {}, release_cutoff(days)
+    ], sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def write_plan(plans, path, shared_reads=0):
+    """Write --plan results as JSON to path, or print them for "-".
+
+    shared_reads counts reads made for all the plans together, such as
+    a profile's up-front show fetch, and is included in the totals.
+    """
+    totals = {
+        key: sum(plan["requests"][key] for plan in plans)
+        for key in ("reads", "apply", "writes")
+    }
+    totals["reads"] += shared_reads
+    content = json.dumps({
+        "playlists": plans,
+        "shared_reads": shared_reads,
+        "requests": totals
+    }, indent=2)
+    if path == "-":
+        print(content)
+        return
+    with open(path, "w") as f:
+        f.write(content + "\n")
 
 
 class SpotifyDailyPodcasts:
     """Handles Spotify authentication and playlist operations."""
     
-    def __init__(self, playlist_name="Daily Podcasts"):
-        self.client_id = SPOTIFY_CLIENT_ID
-        self.client_secret = SPOTIFY_CLIENT_SECRET
+    def __init__(self, playlist_name="Daily Podcasts", pool_size=HTTP_POOL_SIZE,
+                 timeout=HTTP_TIMEOUT, max_retries=HTTP_MAX_RETRIES, client_id=None,
+                 client_secret=None, state_path=None, rate_limit=RATE_LIMIT,
+                 rate_burst=RATE_LIMIT_BURST):
+        self.client_id = client_id or SPOTIFY_CLIENT_ID
+        self.client_secret = client_secret or SPOTIFY_CLIENT_SECRET
         self.access_token = None
         self.refresh_token = None
         self.token_expiry = 0
         self.user_id = None
         self.playlist_name = playlist_name
         self.playlist_id = None
+        self.playlist_index = None
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.token_refresher = None
+        self.metrics = RunMetrics()
+        self.episode_cache = None
+        self.episode_cache_lock = threading.Lock()
+        self.fresh_shows = set()
+        self.show_pages = {}
+        # Show IDs whose episodes this client saves to its state database (None: all)
+        self.own_shows = None
+        self.use_async = False
+        self.async_loop = None
+        self.async_engine = None
+        # Optional cap on this client's request rate (both engines), e.g. per tenant
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst) if rate_limit else None
         
         if self.client_id == "your_client_id_here" or self.client_secret == "your_client_secret_here":
             print("\n❌ Missing Spotify credentials!")
@@ -119,51 +1019,102 @@ class SpotifyDailyPodcasts:
             print("  SPOTIFY_CLIENT_SECRET = 'your_actual_client_secret'")
             print("\nGet these from https://developer.spotify.com/dashboard")
             sys.exit(1)
+        
+        # Legacy JSON files belong to the default state database only
+        self.state = StateStore(state_path or STATE_DB, import_legacy=state_path is None)
+        
+        self.pool_size = pool_size
+        self._session = None
+        self.session_lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """One pooled requests session, so every call reuses keep-alive
+        connections. Created (and requests imported) on first use."""
+        with self.session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
     
     def load_cached_token(self):
-        """Load token from cache file if it exists."""
-        if TOKEN_CACHE.exists():
-            try:
-                with open(TOKEN_CACHE) as f:
-                    data = json.load(f)
-                    self.access_token = data.get("access_token")
-                    self.refresh_token = data.get("refresh_token")
-                    self.token_expiry = data.get("expiry", 0)
-                    return True
-            except (json.JSONDecodeError, KeyError):
-                pass
+        """Load token from the state store if it exists."""
+        token = self.state.load_token()
+        if token and token[0]:
+            self.access_token, self.refresh_token, self.token_expiry = token
+            return True
         return False
     
     def save_token(self):
-        """Save token to cache file."""
-        with open(TOKEN_CACHE, "w") as f:
-            json.dump({
-                "access_token": self.access_token,
-                "refresh_token": self.refresh_token,
-                "expiry": self.token_expiry
-            }, f)
-        TOKEN_CACHE.chmod(0o600)
+        """Save token to the state store."""
+        self.state.save_token(self.access_token, self.refresh_token, self.token_expiry)
     
     def load_playlist_cache(self):
-        """Load cached playlist ID."""
-        if PLAYLIST_CACHE.exists():
-            try:
-                with open(PLAYLIST_CACHE) as f:
-                    data = json.load(f)
-                    if data.get("name") == self.playlist_name:
-                        self.playlist_id = data.get("id")
-                        return True
-            except (json.JSONDecodeError, KeyError):
-                pass
+        """Load the playlist name index and look up the cached playlist ID."""
+        if self.playlist_index is None:
+            names = self.state.load_playlists()
+            self.playlist_index = {"playlists": names, "saved": dict(names)}
+        
+        playlist_id = self.playlist_index["playlists"].get(self.playlist_name)
+        if playlist_id:
+            self.playlist_id = playlist_id
+            return True
         return False
     
     def save_playlist_cache(self):
-        """Save playlist ID to cache."""
-        with open(PLAYLIST_CACHE, "w") as f:
-            json.dump({
-                "name": self.playlist_name,
-                "id": self.playlist_id
-            }, f)
+        """Save playlist ID and index changes since the last save to the state store."""
+        if self.playlist_index is None:
+            self.load_playlist_cache()
+        names, saved = self.playlist_index["playlists"], self.playlist_index["saved"]
+        if self.playlist_id:
+            names[self.playlist_name] = self.playlist_id
+        self.state.save_playlists(
+            {name: playlist_id for name, playlist_id in names.items() if saved.get(name) != playlist_id},
+            {name: playlist_id for name, playlist_id in saved.items() if name not in names}
+        )
+        self.playlist_index["saved"] = dict(names)
+    
+    def load_episode_cache(self):
+        """Load cached show episodes, dropping shows not seen recently."""
+        self.episode_cache = self.state.load_shows(EPISODE_CACHE_MAX_AGE)
+        return bool(self.episode_cache)
+    
+    def save_episode_cache(self):
+        """Save cached show episodes (only own_shows, if set)."""
+        if self.episode_cache is None:
+            return
+        with self.episode_cache_lock:
+            data = {
+                show_id: entry for show_id, entry in self.episode_cache.items()
+                if self.own_shows is None or show_id in self.own_shows
+            }
+        self.state.save_shows(data)
+    
+    def share_episode_cache(self, other):
+        """Use another client's episode cache, fresh-show set and older pages.
+
+        Shows fetched by either client during the run are then reused by
+        both instead of being fetched again. This client's own cached
+        shows are merged in first, so their ETags are still used.
+        """
+        if other.episode_cache is None:
+            other.load_episode_cache()
+        own = self.state.load_shows(EPISODE_CACHE_MAX_AGE)
+        with other.episode_cache_lock:
+            for show_id, entry in own.items():
+                current = other.episode_cache.get(show_id)
+                if not current or current["fetched_at"] < entry["fetched_at"]:
+                    other.episode_cache[show_id] = entry
+        self.episode_cache = other.episode_cache
+        self.episode_cache_lock = other.episode_cache_lock
+        self.fresh_shows = other.fresh_shows
+        self.show_pages = other.show_pages
     
     def get_auth_url(self):
         """Generate Spotify authorization URL."""
@@ -178,12 +1129,15 @@ class SpotifyDailyPodcasts:
     
     def exchange_code(self, code):
         """Exchange authorization code for access token."""
+        import base64
+        
         auth_header = base64.b64encode(
             f"{self.client_id}:{self.client_secret}".encode()
         ).decode()
         
-        response = requests.post(
-            "https://accounts.spotify.com/api/token",
+        response = self.request(
+            "POST",
+            TOKEN_URL,
             headers={"Authorization": f"Basic {auth_header}"},
             data={
                 "grant_type": "authorization_code",
@@ -202,47 +1156,134 @@ class SpotifyDailyPodcasts:
         return False
     
     def refresh_access_token(self):
-        """Refresh the access token using refresh token."""
+        """Refresh the access token using refresh token.
+
+        Refreshes are coalesced across threads and processes: only the
+        holder of the state database's refresh lease calls Spotify, and
+        the others wait for it and adopt the token it stores instead of
+        refreshing again (which could invalidate a rotated refresh token).
+        The refresh request is a single attempt with a short timeout, so
+        a stuck refresh can't hold the lease for long.
+        """
+        import base64
+        import requests
+        
         if not self.refresh_token:
             return False
         
-        auth_header = base64.b64encode(
-            f"{self.client_id}:{self.client_secret}".encode()
-        ).decode()
+        def adopt_stored():
+            try:
+                current = self.state.load_token()
+            except sqlite3.OperationalError:
+                return False
+            if current and current[0] != self.access_token and \
+                    current[2] > time.time() + TOKEN_REFRESH_MARGIN:
+                self.access_token, self.refresh_token, self.token_expiry = current
+                return True
+            return False
         
-        response = requests.post(
-            "https://accounts.spotify.com/api/token",
-            headers={"Authorization": f"Basic {auth_header}"},
-            data={
-                "grant_type": "refresh_token",
-                "refresh_token": self.refresh_token
-            }
-        )
+        holder = f"{os.getpid()}:{threading.get_ident()}"
+        deadline = time.time() + TOKEN_REFRESH_LEASE + 5
+        while True:
+            if adopt_stored():
+                return True
+            try:
+                if self.state.claim_token_refresh(holder, TOKEN_REFRESH_LEASE):
+                    break
+            except sqlite3.OperationalError:
+                pass
+            if time.time() > deadline:
+                return False
+            time.sleep(0.25)
         
-        if response.status_code == 200:
+        try:
+            # Someone may have finished between the check and the claim
+            if adopt_stored():
+                return True
+            
+            stored = self.state.load_token()
+            refresh_token = (stored and stored[1]) or self.refresh_token
+            auth_header = base64.b64encode(
+                f"{self.client_id}:{self.client_secret}".encode()
+            ).decode()
+            
+            try:
+                response = self.request(
+                    "POST",
+                    TOKEN_URL,
+                    headers={"Authorization": f"Basic {auth_header}"},
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": refresh_token
+                    },
+                    timeout=TOKEN_REFRESH_TIMEOUT,
+                    retries=0
+                )
+            except requests.RequestException:
+                return False
+            if response.status_code != 200:
+                return False
+            
             data = response.json()
             self.access_token = data["access_token"]
-            if "refresh_token" in data:
-                self.refresh_token = data["refresh_token"]
+            self.refresh_token = data.get("refresh_token", refresh_token)
             self.token_expiry = time.time() + data["expires_in"] - 60
-            self.save_token()
+            try:
+                self.save_token()
+            except sqlite3.OperationalError:
+                # Still usable by this run; others refresh again
+                print("   ⚠️  Couldn't save the refreshed token (state database busy)")
             return True
-        return False
+        finally:
+            try:
+                self.state.release_token_refresh(holder)
+            except sqlite3.OperationalError:
+                pass
+    
+    def start_token_refresher(self):
+        """Refresh the access token in the background before it expires.
+
+        Wakes TOKEN_REFRESH_MARGIN before token_expiry, so requests never
+        wait on an inline refresh. Returns the thread's stop event.
+        """
+        if self.token_refresher:
+            return self.token_refresher
+        
+        stop = threading.Event()
+        
+        def run():
+            while not stop.is_set():
+                wait = self.token_expiry - TOKEN_REFRESH_MARGIN - time.time()
+                if wait > 0:
+                    stop.wait(min(wait, 60 * 60))
+                elif not self.refresh_access_token():
+                    stop.wait(60)
+        
+        threading.Thread(target=run, name="token-refresher", daemon=True).start()
+        self.token_refresher = stop
+        return stop
     
-    def ensure_authenticated(self):
-        """Ensure we have a valid access token."""
+    def ensure_authenticated(self, interactive=True):
+        """Ensure we have a valid access token.
+
+        Falls back to authorizing in the browser, unless interactive is
+        False, in which case it just returns False.
+        """
         if self.load_cached_token():
             if time.time() < self.token_expiry:
                 return True
             if self.refresh_access_token():
                 return True
         
+        if not interactive:
+            return False
+        
         print("\n🔐 Opening browser for Spotify authorization...")
         auth_url = self.get_auth_url()
+        import webbrowser
         webbrowser.open(auth_url)
         
-        server = HTTPServer(("localhost", 8888), OAuthCallbackHandler)
-        server.auth_code = None
+        server = oauth_callback_server(urlparse(REDIRECT_URI).port)
         server.handle_request()
         
         if server.auth_code:
@@ -253,14 +1294,71 @@ class SpotifyDailyPodcasts:
         print("❌ Authorization failed")
         return False
     
+    def retry_delay(self, response, attempt):
+        """Seconds to wait before retrying, honouring Retry-After."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    return max(float(retry_after), 0)
+                except ValueError:
+                    pass
+        return HTTP_BACKOFF * (2 ** attempt)
+    
+    def request(self, method, url, retries=None, idempotent=True, **kwargs):
+        """Send an HTTP request over the shared session.
+
+        Retries rate-limited (429) and server error (5xx) responses as
+        well as connection failures, backing off between attempts, up to
+        retries times (default: max_retries). Requests that mustn't be
+        applied twice (idempotent=False) are only retried when Spotify
+        can't have acted on them: on 429s and failures to connect.
+        """
+        import requests
+        
+        max_retries = self.max_retries if retries is None else retries
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        
+        for attempt in range(max_retries + 1):
+            if self.rate_limiter:
+                time.sleep(self.rate_limiter.reserve())
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                retryable = isinstance(e, requests.ConnectionError) if idempotent else connect_failed(e)
+                if retryable and attempt < max_retries:
+                    time.sleep(self.retry_delay(None, attempt))
+                    continue
+                self.metrics.record_request(
+                    method, url, "error", time.perf_counter() - start, 0, attempt
+                )
+                raise
+            
+            if response.status_code != 429 and (response.status_code < 500 or not idempotent):
+                break
+            if attempt == max_retries:
+                break
+            
+            delay = self.retry_delay(response, attempt)
+            if delay > HTTP_MAX_RETRY_WAIT:
+                break
+            time.sleep(delay)
+        
+        self.metrics.record_request(
+            method, url, response.status_code, time.perf_counter() - start,
+            len(response.content), attempt
+        )
+        return response
+    
     def api_request(self, method, endpoint, **kwargs):
         """Make authenticated API request."""
         headers = kwargs.pop("headers", {})
         headers["Authorization"] = f"Bearer {self.access_token}"
         
-        response = requests.request(
+        response = self.request(
             method,
-            f"https://api.spotify.com/v1{endpoint}",
+            f"{API_BASE}{endpoint}",
             headers=headers,
             **kwargs
         )
@@ -277,13 +1375,41 @@ class SpotifyDailyPodcasts:
             return self.user_id
         return None
     
+    def index_playlists(self, playlists, owner_id):
+        """Record name -> ID for the user's own playlists in a listing page."""
+        names = self.playlist_index["playlists"]
+        known = {playlist_id: name for name, playlist_id in names.items()}
+        for playlist in playlists:
+            if owner_id and playlist["owner"]["id"] != owner_id:
+                continue
+            if known.get(playlist["id"]) != playlist["name"]:
+                if playlist["id"] in known:
+                    names.pop(known[playlist["id"]], None)
+                names[playlist["name"]] = playlist["id"]
+                known[playlist["id"]] = playlist["name"]
+    
     def find_playlist(self):
-        """Find existing playlist by name."""
+        """Find existing playlist by name.
+
+        Uses the local name index where possible, checking the cached ID
+        with a request for just its name. Otherwise scans /me/playlists,
+        indexing every playlist the user owns along the way. A miss always
+        scans the whole library: Spotify doesn't move renamed playlists to
+        the front, so no prefix of the listing can rule a name out.
+        """
         if self.load_playlist_cache():
-            # Verify it still exists
-            response = self.api_request("GET", f"/playlists/{self.playlist_id}")
-            if response.status_code == 200:
+            # Verify it still exists (and still has this name)
+            response = self.api_request(
+                "GET", f"/playlists/{self.playlist_id}",
+                params={"fields": "name"}
+            )
+            if response.status_code == 200 and response.json().get("name") == self.playlist_name:
                 return self.playlist_id
+            
+            del self.playlist_index["playlists"][self.playlist_name]
+            self.playlist_id = None
+        
+        owner_id = self.get_user_id()
         
         # Search through user's playlists
         offset = 0
@@ -296,16 +1422,17 @@ class SpotifyDailyPodcasts:
                 break
             
             data = response.json()
-            for playlist in data["items"]:
-                if playlist["name"] == self.playlist_name:
-                    self.playlist_id = playlist["id"]
-                    self.save_playlist_cache()
-                    return self.playlist_id
+            self.index_playlists(data["items"], owner_id)
+            if self.playlist_name in self.playlist_index["playlists"]:
+                self.playlist_id = self.playlist_index["playlists"][self.playlist_name]
+                self.save_playlist_cache()
+                return self.playlist_id
             
             if not data["next"]:
                 break
             offset += 50
         
+        self.save_playlist_cache()
         return None
     
     def create_playlist(self):
@@ -322,7 +1449,8 @@ class SpotifyDailyPodcasts:
                 "name": self.playlist_name,
                 "description": f"Daily podcast episodes, updated {today}. Auto-generated.",
                 "public": False
-            }
+            },
+            idempotent=False
         )
         
         if response.status_code == 201:
@@ -338,70 +1466,222 @@ class SpotifyDailyPodcasts:
             return playlist_id
         return self.create_playlist()
     
-    def get_playlist_episodes(self):
-        """Get all episode URIs currently in the playlist."""
+    def get_playlist_snapshot(self):
+        """Get the playlist's current snapshot_id."""
+        response = self.api_request(
+            "GET",
+            f"/playlists/{self.playlist_id}",
+            params={"fields": "snapshot_id"}
+        )
+        if response.status_code == 200:
+            return response.json().get("snapshot_id")
+        return None
+    
+    def get_playlist_episodes(self, include_unavailable=False, workers=1):
+        """Get all episode URIs currently in the playlist.
+
+        Only the item URIs are requested. Once the first page reports the
+        total, the remaining pages are fetched up to `workers` at a time.
+
+        With include_unavailable, items Spotify can no longer resolve are
+        kept as None so the list lines up with playlist positions. Returns
+        None if any page couldn't be read, rather than a partial list.
+        """
         if not self.playlist_id:
             return []
+        if self.use_async:
+            return self.run_async(
+                lambda engine: engine.get_playlist_episodes(include_unavailable=include_unavailable)
+            )
         
-        episodes = []
-        offset = 0
-        
-        while True:
+        def fetch_page(offset):
             response = self.api_request(
                 "GET",
                 f"/playlists/{self.playlist_id}/tracks",
-                params={"limit": 100, "offset": offset}
+                params={
+                    "limit": 100,
+                    "offset": offset,
+                    "fields": "items(track(uri)),next,total"
+                }
             )
             if response.status_code != 200:
-                break
-            
-            data = response.json()
+                return None
+            return response.json()
+        
+        first = fetch_page(0)
+        if first is None:
+            return None
+        
+        pages = [first]
+        offsets = range(100, first["total"], 100) if first["next"] else []
+        if workers > 1 and len(offsets) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                pages.extend(pool.map(fetch_page, offsets))
+            if None in pages:
+                return None
+        else:
+            for offset in offsets:
+                page = fetch_page(offset)
+                if page is None:
+                    return None
+                pages.append(page)
+        
+        episodes = []
+        for data in pages:
             for item in data["items"]:
                 if item["track"]:
                     episodes.append(item["track"]["uri"])
-            
-            if not data["next"]:
-                break
-            offset += 100
+                elif include_unavailable:
+                    episodes.append(None)
         
         return episodes
     
-    def clear_playlist(self):
-        """Remove all episodes from the playlist."""
-        episodes = self.get_playlist_episodes()
-        if not episodes:
+    def write_batches(self, batches, snapshot_id=None):
+        """Send playlist write batches in order, journaling each one.
+
+        Each batch is a (method, body) pair for the playlist's tracks
+        endpoint. Progress and the snapshot_id after every batch are
+        written to the state database, so if a batch fails the next run
+        can pick up from there with resume_writes().
+        """
+        if not batches:
             return True
+        self.state.start_journal(self.playlist_id, batches, snapshot_id)
+        return self.send_batches(batches, 0, snapshot_id)
+    
+    def send_batches(self, batches, start, snapshot_id):
+        """Send batches[start:], advancing the journal after each one."""
+        endpoint = f"/playlists/{self.playlist_id}/tracks"
         
-        # Spotify allows removing up to 100 tracks at a time
-        for i in range(0, len(episodes), 100):
-            batch = episodes[i:i+100]
-            response = self.api_request(
-                "DELETE",
-                f"/playlists/{self.playlist_id}/tracks",
-                json={"tracks": [{"uri": uri} for uri in batch]}
-            )
-            if response.status_code != 200:
+        for i in range(start, len(batches)):
+            method, body = batches[i]
+            # Removals and reorders apply to the version we planned against
+            if snapshot_id and (method == "DELETE" or "range_start" in body):
+                body = dict(body, snapshot_id=snapshot_id)
+            # An insert sent twice adds the episodes twice, with or without a position
+            response = self.api_request(method, endpoint, json=body, idempotent=method != "POST")
+            if response.status_code not in (200, 201):
                 return False
+            
+            snapshot_id = response.json().get("snapshot_id")
+            self.state.advance_journal(self.playlist_id, i + 1, snapshot_id)
         
+        self.state.clear_journal(self.playlist_id)
         return True
     
+    def load_resumable_journal(self):
+        """Load the playlist's interrupted write journal.
+
+        Returns (journal, resumable): the journal or None, and whether the
+        playlist is still at the snapshot its last successful batch left
+        it at, so the remaining batches can be sent as planned.
+        """
+        journal = self.state.load_journal(self.playlist_id, WRITE_JOURNAL_MAX_AGE)
+        if not journal:
+            return None, False
+        return journal, bool(journal["snapshot_id"]) and \
+            self.get_playlist_snapshot() == journal["snapshot_id"]
+    
+    def resume_writes(self):
+        """Finish write batches an earlier run didn't get through.
+
+        Only resumes if the playlist is still at the snapshot the last
+        successful batch left it at; otherwise the journal is dropped
+        and the next sync works from the playlist as it is. Returns the
+        number of batches sent, or None if there was nothing to resume.
+        """
+        journal, resumable = self.load_resumable_journal()
+        if not journal:
+            return None
+        
+        batches, done = journal["batches"], journal["done"]
+        if not resumable:
+            print("   ⚠️  Playlist changed since the last interrupted update, starting over")
+            self.state.clear_journal(self.playlist_id)
+            return None
+        
+        print(f"   ⏯️  Resuming interrupted update at batch {done + 1} of {len(batches)}")
+        if not self.send_batches(batches, done, journal["snapshot_id"]):
+            # Don't retry the same failing batch forever; the sync will redo it
+            self.state.clear_journal(self.playlist_id)
+            print("   ❌ Resume failed")
+            return None
+        return len(batches) - done
+    
+    def clear_playlist(self):
+        """Remove all episodes from the playlist."""
+        episodes = self.get_playlist_episodes()
+        if episodes is None:
+            return False
+        
+        # Spotify allows removing up to 100 tracks at a time
+        return self.write_batches([
+            ("DELETE", {"tracks": [{"uri": uri} for uri in episodes[i:i+100]]})
+            for i in range(0, len(episodes), 100)
+        ])
+    
     def add_episodes_to_playlist(self, episode_uris):
         """Add episodes to the playlist."""
-        if not episode_uris:
-            return True
-        
         # Spotify allows adding up to 100 tracks at a time
-        for i in range(0, len(episode_uris), 100):
-            batch = episode_uris[i:i+100]
-            response = self.api_request(
-                "POST",
-                f"/playlists/{self.playlist_id}/tracks",
-                json={"uris": batch}
-            )
-            if response.status_code != 201:
-                return False
+        return self.write_batches([
+            ("POST", {"uris": episode_uris[i:i+100]})
+            for i in range(0, len(episode_uris), 100)
+        ])
+    
+    def replace_playlist(self, episode_uris):
+        """Replace the whole playlist with the given episodes."""
+        return self.write_batches(
+            [("PUT", {"uris": episode_uris[:100]})]
+            + [("POST", {"uris": episode_uris[i:i+100]}) for i in range(100, len(episode_uris), 100)]
+        )
+    
+    def apply_sync_plan(self, plan, snapshot_id=None):
+        """Apply a plan from plan_playlist_sync, one batch at a time."""
+        return self.write_batches(
+            [("DELETE", {"tracks": [{"uri": uri} for uri in batch]}) for batch in plan["remove"]]
+            + [("PUT", {"range_start": range_start, "insert_before": insert_before})
+               for range_start, insert_before in plan["move"]]
+            + [("POST", {"uris": batch, "position": position}) for position, batch in plan["add"]],
+            snapshot_id
+        )
+    
+    def sync_playlist(self, episode_uris, workers=1):
+        """Make the playlist contain exactly episode_uris, in order.
+
+        Only the episodes that changed are removed, moved or inserted, so
+        on a day with nothing new no writes are made at all. Falls back to
+        a full replace when that needs fewer requests.
+
+        Returns a dict with the removed/moved/added counts and the number
+        of write requests, or None if a write failed or the playlist
+        couldn't be read (in which case nothing is written).
+        """
+        snapshot_id = self.get_playlist_snapshot()
+        current = self.get_playlist_episodes(include_unavailable=True, workers=workers)
+        if current is None:
+            print("   ❌ Couldn't read the playlist, nothing was changed")
+            return None
+        plan = choose_sync_plan(current, episode_uris)
         
-        return True
+        if plan is None:
+            if not self.replace_playlist(episode_uris):
+                return None
+            return {
+                "removed": len(current),
+                "moved": 0,
+                "added": len(episode_uris),
+                "writes": replace_write_count(episode_uris)
+            }
+        
+        if not self.apply_sync_plan(plan, snapshot_id):
+            return None
+        return {
+            "removed": sum(len(batch) for batch in plan["remove"]),
+            "moved": len(plan["move"]),
+            "added": sum(len(batch) for _, batch in plan["add"]),
+            "writes": plan_write_count(plan)
+        }
     
     def update_playlist_description(self):
         """Update playlist description with current date."""
@@ -414,6 +1694,15 @@ class SpotifyDailyPodcasts:
             }
         )
     
+    def cover_is_current(self, image_path):
+        """Check whether this exact image was already uploaded to the playlist."""
+        try:
+            with open(image_path, "rb") as f:
+                image_hash = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return False
+        return self.state.load_cover(self.playlist_id) == image_hash
+    
     def set_playlist_cover(self, image_path):
         """Upload a custom cover image for the playlist."""
         if not image_path:
@@ -428,18 +1717,22 @@ class SpotifyDailyPodcasts:
                 print(f"   ⚠️  Cover image too large ({len(image_data) // 1024}KB > 256KB)")
                 return False
             
+            import base64
+            
+            image_hash = hashlib.sha256(image_data).hexdigest()
             image_b64 = base64.b64encode(image_data).decode()
             
-            response = requests.put(
-                f"https://api.spotify.com/v1/playlists/{self.playlist_id}/images",
-                headers={
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "image/jpeg"
-                },
+            response = self.api_request(
+                "PUT",
+                f"/playlists/{self.playlist_id}/images",
+                headers={"Content-Type": "image/jpeg"},
                 data=image_b64
             )
             
-            return response.status_code == 202
+            if response.status_code == 202:
+                self.state.save_cover(self.playlist_id, image_hash)
+                return True
+            return False
         except FileNotFoundError:
             print(f"   ⚠️  Cover image not found: {image_path}")
             return False
@@ -447,107 +1740,497 @@ class SpotifyDailyPodcasts:
             print(f"   ⚠️  Error setting cover: {e}")
             return False
     
-    def get_recent_episodes(self, show_id, days=1, keep_latest=False):
-        """Get episodes from the last N days.
+    def cached_show_episodes(self, show_id):
+        """Look up a show in the episode cache.
 
-        With keep_latest, falls back to the show's most recent episode
-        when nothing was released within the window.
+        Returns (episodes, headers): the cached episodes if they can be
+        used without asking Spotify, otherwise None and the conditional
+        request headers to send.
         """
-        cutoff = datetime.now() - timedelta(days=days)
-        episodes = []
-        latest = None
+        if self.episode_cache is None:
+            self.load_episode_cache()
+        
+        with self.episode_cache_lock:
+            entry = self.episode_cache.get(show_id)
+        
+        if entry and (show_id in self.fresh_shows
+                      or time.time() - entry["fetched_at"] < EPISODE_CACHE_TTL):
+            return entry["episodes"], None
+        
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        return None, headers
+    
+    def store_show_episodes(self, show_id, response):
+        """Cache the first page of a show's episodes from a response.
+
+        A 304 refreshes the cached entry. Returns the show's episodes, or
+        None if the request failed.
+        """
+        now = time.time()
+        with self.episode_cache_lock:
+            entry = self.episode_cache.get(show_id)
+            if response.status_code == 304 and entry:
+                entry["fetched_at"] = now
+                self.fresh_shows.add(show_id)
+                return entry["episodes"]
+        
+        if response.status_code != 200:
+            return None
+        
+        data = response.json()
+        episodes = [episode_entry(episode) for episode in data["items"] if episode]
+        
+        with self.episode_cache_lock:
+            # Older pages fetched this run may no longer line up
+            self.show_pages.pop(show_id, None)
+            self.episode_cache[show_id] = {
+                "fetched_at": now,
+                "etag": response.headers.get("ETag"),
+                "total_episodes": data.get("total"),
+                "has_more": bool(data.get("next")),
+                "latest_uri": episodes[0]["uri"] if episodes else None,
+                "episodes": episodes
+            }
+            self.fresh_shows.add(show_id)
+        return episodes
+    
+    def get_show_episodes(self, show_id):
+        """Get a show's latest episodes, using the episode cache.
 
+        Episodes fetched earlier in this run or within EPISODE_CACHE_TTL
+        are reused as-is. Older entries are revalidated with If-None-Match,
+        so an unchanged show costs a bodyless 304. Returns None if the
+        request fails.
+        """
+        episodes, headers = self.cached_show_episodes(show_id)
+        if episodes is not None:
+            return episodes
+        
         response = self.api_request(
             "GET",
             f"/shows/{show_id}/episodes",
-            params={"limit": 10, "market": "US"}
+            params={"limit": EPISODE_FIRST_PAGE, "market": "US"},
+            headers=headers
         )
+        return self.store_show_episodes(show_id, response)
+    
+    def fetched_show_pages(self, show_id):
+        """Older episodes already paged through this run.
 
-        if response.status_code == 200:
+        Returns (episodes, offset, has_more): the episodes after the first
+        page, the offset of the next page to request and whether there is
+        one.
+        """
+        with self.episode_cache_lock:
+            pages = self.show_pages.get(show_id)
+            if pages:
+                return list(pages["episodes"]), pages["offset"], pages["has_more"]
+            has_more = self.episode_cache.get(show_id, {}).get("has_more", True)
+            return [], EPISODE_FIRST_PAGE, has_more
+    
+    def remember_show_page(self, show_id, offset, episodes, has_more):
+        """Keep an older page of a show's episodes for the rest of the run."""
+        with self.episode_cache_lock:
+            pages = self.show_pages.setdefault(
+                show_id, {"episodes": [], "offset": EPISODE_FIRST_PAGE, "has_more": True}
+            )
+            if pages["offset"] == offset:
+                pages["episodes"].extend(episodes)
+                pages["offset"] = offset + EPISODE_PAGE_SIZE
+                pages["has_more"] = has_more
+    
+    def iter_show_episodes(self, show_id):
+        """Yield a show's episodes newest first, paging back lazily.
+
+        The first page comes from get_show_episodes and its cache, and
+        older pages another playlist already paged through this run are
+        reused. Further pages are only requested once the caller has
+        consumed everything before them, so a caller that stops early
+        pays for nothing more.
+        """
+        episodes = self.get_show_episodes(show_id)
+        if episodes is None:
+            return
+        
+        seen = set()
+        older, offset, has_more = self.fetched_show_pages(show_id)
+        for entry in episodes + older:
+            # Pages can overlap the cached first page if the show published since
+            if entry["uri"] not in seen:
+                seen.add(entry["uri"])
+                yield entry
+        
+        while has_more:
+            response = self.api_request(
+                "GET",
+                f"/shows/{show_id}/episodes",
+                params={"limit": EPISODE_PAGE_SIZE, "offset": offset, "market": "US"}
+            )
+            if response.status_code != 200:
+                return
+            
             data = response.json()
-            for episode in data["items"]:
-                # Parse release date
-                release_date = episode["release_date"]
-                try:
-                    if len(release_date) == 10:  # YYYY-MM-DD
-                        ep_date = datetime.strptime(release_date, "%Y-%m-%d")
-                    else:  # YYYY
-                        ep_date = datetime.strptime(release_date, "%Y")
-
-                    entry = {
-                        "uri": episode["uri"],
-                        "name": episode["name"],
-                        "duration_ms": episode["duration_ms"],
-                        "release_date": release_date
-                    }
+            page = [episode_entry(episode) for episode in data["items"] if episode]
+            has_more = bool(data["next"])
+            self.remember_show_page(show_id, offset, page, has_more)
+            for entry in page:
+                if entry["uri"] not in seen:
+                    seen.add(entry["uri"])
+                    yield entry
+            
+            offset += EPISODE_PAGE_SIZE
+    
+    def get_show_totals(self, show_ids):
+        """Get total_episodes for many shows, 50 per request."""
+        totals = {}
+        for i in range(0, len(show_ids), 50):
+            response = self.api_request(
+                "GET", "/shows",
+                params={"ids": ",".join(show_ids[i:i+50]), "market": "US"}
+            )
+            if response.status_code != 200:
+                continue
+            for show in response.json()["shows"]:
+                if show:
+                    totals[show["id"]] = show["total_episodes"]
+        return totals
+    
+    def stale_cached_shows(self, show_ids):
+        """Cached shows that need revalidating and can be checked by episode count.
 
-                    if latest is None or ep_date > latest[0]:
-                        latest = (ep_date, entry)
+        Shows whose last real fetch is older than EPISODE_COUNT_MAX_AGE
+        are left out, so they're revalidated with their ETag instead.
+        """
+        if self.episode_cache is None:
+            self.load_episode_cache()
+        
+        now = time.time()
+        with self.episode_cache_lock:
+            return [
+                show_id for show_id in dict.fromkeys(show_ids)
+                if show_id in self.episode_cache
+                and show_id not in self.fresh_shows
+                and self.episode_cache[show_id].get("total_episodes") is not None
+                and EPISODE_CACHE_TTL <= now - self.episode_cache[show_id]["fetched_at"]
+                < EPISODE_COUNT_MAX_AGE
+            ]
+    
+    def mark_unchanged_shows(self, totals):
+        """Mark cached shows whose total_episodes still matches as fresh for this run.
 
-                    if ep_date >= cutoff:
-                        episodes.append(entry)
-                except ValueError:
+        A matching count is only a hint (a show that drops its oldest
+        episode when it publishes keeps the same count), so fetched_at,
+        the time of the last real fetch, is left alone: once it's older
+        than EPISODE_COUNT_MAX_AGE the show is revalidated with its ETag
+        again. Shows whose count changed are expired, even within
+        EPISODE_CACHE_TTL, so they're fetched again.
+        """
+        now = time.time()
+        with self.episode_cache_lock:
+            for show_id, total in totals.items():
+                entry = self.episode_cache.get(show_id)
+                if not entry:
                     continue
+                if entry.get("total_episodes") == total:
+                    if now - entry["fetched_at"] < EPISODE_COUNT_MAX_AGE:
+                        self.fresh_shows.add(show_id)
+                else:
+                    entry["fetched_at"] = 0
+                    self.fresh_shows.discard(show_id)
+    
+    def check_show_updates(self, show_ids):
+        """Refresh cached shows whose episode count hasn't changed.
+
+        Asks the multi-show endpoint for every stale cached show at once;
+        shows with the same total_episodes as last time are marked as
+        unchanged, so only shows with new (or removed) episodes are
+        fetched again.
+        """
+        stale = self.stale_cached_shows(show_ids)
+        
+        # A single stale show is just as cheap to revalidate directly
+        if len(stale) < 2:
+            return
+        
+        self.mark_unchanged_shows(self.get_show_totals(stale))
+    
+    def get_recent_episodes(self, show_id, days=1, keep_latest=False):
+        """Get episodes from the last N days.
+
+        With keep_latest, falls back to the show's most recent episode
+        when nothing was released within the window. Episodes arrive
+        newest first, so paging stops at the first one before the window.
+        """
+        cutoff = release_cutoff(days)
+        episodes = []
+        latest = None
+
+        for entry in self.iter_show_episodes(show_id):
+            try:
+                ep_date = release_date_key(entry["release_date"])
+            except ValueError:
+                continue
+
+            if latest is None or ep_date > latest[0]:
+                latest = (ep_date, entry)
+
+            if ep_date < cutoff:
+                break
+            episodes.append(entry)
 
         if not episodes and keep_latest and latest:
             episodes.append(latest[1])
 
         return episodes
     
-    def update_daily_playlist(self, days=1, keep_old=False, keep_latest=False):
-        """Main function to update the daily podcast playlist."""
-        print("🎧 Daily Podcast Playlist")
-        print("=" * 50)
+    def fetch_podcast_episodes(self, podcasts, days=1, keep_latest=False, workers=1):
+        """Get recent episodes for each podcast, optionally in parallel.
+
+        Returns (podcast, episodes, error) tuples in the same order as
+        podcasts. A show that fails is reported through its error entry
+        instead of stopping the others.
+        """
+        if self.use_async:
+            return self.run_async(
+                lambda engine: engine.fetch_podcast_episodes(podcasts, days, keep_latest)
+            )
         
-        # Get or create playlist
-        print(f"\n📋 Playlist: {self.playlist_name}")
-        playlist_id = self.get_or_create_playlist()
-        if not playlist_id:
-            print("   ❌ Failed to create/find playlist")
-            return False
+        def fetch(podcast):
+            try:
+                episodes = self.get_recent_episodes(podcast["show_id"], days, keep_latest)
+                return podcast, episodes, None
+            except Exception as e:
+                return podcast, [], e
+
+        self.check_show_updates([podcast["show_id"] for podcast in podcasts])
         
-        # Set custom cover if configured
-        if PLAYLIST_COVER_IMAGE:
-            print("   🖼️  Setting cover image...")
-            if self.set_playlist_cover(PLAYLIST_COVER_IMAGE):
-                print("   ✅ Cover updated!")
+        if workers > 1 and len(podcasts) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(fetch, podcasts))
+        else:
+            results = [fetch(podcast) for podcast in podcasts]
         
-        existing_episodes = set(self.get_playlist_episodes()) if keep_old else set()
+        self.save_episode_cache()
+        return results
+    
+    def run_async(self, func):
+        """Run func(engine) on this client's AsyncSpotifyDailyPodcasts and return its result.
+
+        The engine and its event loop are created on first use and kept
+        until close_async(), so every show fetch and playlist read of a
+        run (or a whole profile or daemon) shares one connection pool.
+        """
+        import asyncio
         
-        if not keep_old:
-            print("   🧹 Clearing old episodes...")
-            self.clear_playlist()
+        if self.async_engine is None:
+            loop = asyncio.new_event_loop()
+            engine = AsyncSpotifyDailyPodcasts(self)
+            loop.run_until_complete(engine.__aenter__())
+            self.async_loop, self.async_engine = loop, engine
+        return self.async_loop.run_until_complete(func(self.async_engine))
+    
+    def close_async(self):
+        """Close the async engine and its event loop, if run_async started them."""
+        if self.async_engine is None:
+            return
+        self.async_loop.run_until_complete(self.async_engine.__aexit__(None, None, None))
+        self.async_loop.close()
+        self.async_loop, self.async_engine = None, None
+    
+    def playlist_unchanged(self, podcasts, fingerprint):
+        """Cheaply check whether an update would leave the playlist as it is.
+
+        True if the playlist is still at the snapshot the last --fast
+        update left it at, the options and time window are the same, and
+        no show's episode count has changed. Costs one snapshot request
+        plus one /shows request per 50 shows. The show counts are kept,
+        so if something did change the update doesn't request them again.
+        Counts miss shows that drop an episode for each one they publish,
+        so once a show's episodes were last fetched more than
+        EPISODE_COUNT_MAX_AGE ago the check fails and the update
+        revalidates them.
+        """
+        if not self.load_playlist_cache():
+            return False
+        stored = self.state.load_fast_path(self.playlist_id)
+        if not stored or stored["fingerprint"] != fingerprint:
+            return False
+        if (PLAYLIST_COVER_IMAGE and os.path.exists(PLAYLIST_COVER_IMAGE)
+                and not self.cover_is_current(PLAYLIST_COVER_IMAGE)):
+            return False
+        if self.get_playlist_snapshot() != stored["snapshot_id"]:
+            return False
         
-        # Collect new episodes
-        all_episodes = []
+        show_ids = list(dict.fromkeys(podcast["show_id"] for podcast in podcasts))
+        totals = self.get_show_totals(show_ids)
+        if self.episode_cache is None:
+            self.load_episode_cache()
+        self.mark_unchanged_shows(totals)
+        with self.episode_cache_lock:
+            return all(
+                totals.get(show_id) == stored["shows"].get(show_id) and show_id in self.fresh_shows
+                for show_id in show_ids
+            )
+    
+    def remember_fast_path(self, podcasts, fingerprint):
+        """Record the playlist's snapshot and show counts for the next --fast run."""
+        snapshot_id = self.get_playlist_snapshot()
+        with self.episode_cache_lock:
+            shows = {
+                podcast["show_id"]: self.episode_cache.get(podcast["show_id"], {}).get("total_episodes")
+                for podcast in podcasts
+            }
+        if snapshot_id and None not in shows.values():
+            self.state.save_fast_path(self.playlist_id, snapshot_id, fingerprint, shows)
+        else:
+            self.state.clear_fast_path(self.playlist_id)
+    
+    def collect_episodes(self, podcasts, days, keep_latest, existing_episodes, workers=1,
+                         selection=None):
+        """Fetch recent episodes for podcasts and report them show by show.
+
+        Returns the episodes not already in existing_episodes, chosen and
+        ordered by select_episodes with the given selection options.
+        """
+        show_episodes = []
         
-        for podcast in PODCASTS:
+        with self.metrics.phase("fetch_episodes"):
+            results = self.fetch_podcast_episodes(podcasts, days, keep_latest, workers)
+        
+        for podcast, episodes, error in results:
             print(f"\n🔍 {podcast['name']}...")
+            show_episodes.append([])
             
-            episodes = self.get_recent_episodes(podcast["show_id"], days, keep_latest)
-            if episodes:
+            if error:
+                print(f"   ❌ Failed to fetch episodes: {error}")
+            elif episodes:
                 for ep in episodes:
                     if ep["uri"] not in existing_episodes:
                         duration_min = ep["duration_ms"] // 60000
                         print(f"   📅 {ep['release_date']} - {ep['name'][:40]}{'...' if len(ep['name']) > 40 else ''} ({duration_min}m)")
-                        all_episodes.append(ep)
+                        show_episodes[-1].append(ep)
                     else:
                         print(f"   ⏭️  Already in playlist: {ep['name'][:40]}...")
             else:
                 print(f"   ℹ️  No episodes in the last {days} day(s)")
         
-        # Add episodes to playlist (newest first for each show, but shows in order)
-        if all_episodes:
+        all_episodes = select_episodes(show_episodes, **(selection or {}))
+        candidates = sum(len(episodes) for episodes in show_episodes)
+        if len(all_episodes) < candidates:
+            print(f"\n🎚️  Selected {len(all_episodes)} of {candidates} episode(s)")
+        return all_episodes
+    
+    def update_daily_playlist(self, days=1, keep_old=False, keep_latest=False, workers=1,
+                              podcasts=None, selection=None, fast=False):
+        """Main function to update the daily podcast playlist.
+
+        Returns True if the playlist was brought up to date. selection holds select_episodes options (order, per_show,
+        max_minutes). With fast, the run stops after a couple of cheap
+        checks if nothing changed since the last fast run (see
+        playlist_unchanged), and the description isn't rewritten, as that
+        would give the playlist a new snapshot every time.
+        """
+        if podcasts is None:
+            podcasts = PODCASTS
+        started = time.time()
+        
+        print("🎧 Daily Podcast Playlist")
+        print("=" * 50)
+        
+        print(f"\n📋 Playlist: {self.playlist_name}")
+        if fast:
+            fingerprint = update_fingerprint(podcasts, days, keep_old, keep_latest, selection)
+            with self.metrics.phase("fast_check"):
+                unchanged = self.playlist_unchanged(podcasts, fingerprint)
+            if unchanged:
+                print("   ✅ Nothing changed since the last update")
+                self.state.record_run(started, self.playlist_name, self.playlist_id, 0, 0, True)
+                return True
+        
+        # Get or create playlist
+        with self.metrics.phase("find_playlist"):
+            playlist_id = self.get_or_create_playlist()
+        if not playlist_id:
+            print("   ❌ Failed to create/find playlist")
+            self.state.record_run(started, self.playlist_name, None, 0, None, False)
+            return False
+        
+        # Finish writes an interrupted run left behind, before anything
+        # else changes the playlist's snapshot
+        with self.metrics.phase("resume"):
+            resumed = self.resume_writes()
+        
+        # Set custom cover if configured
+        if PLAYLIST_COVER_IMAGE:
+            with self.metrics.phase("cover"):
+                # Skip the upload if this image is already on the playlist
+                if not self.cover_is_current(PLAYLIST_COVER_IMAGE):
+                    print("   🖼️  Setting cover image...")
+                    if self.set_playlist_cover(PLAYLIST_COVER_IMAGE):
+                        print("   ✅ Cover updated!")
+        
+        existing_episodes = set()
+        if keep_old:
+            with self.metrics.phase("read_playlist"):
+                existing = self.get_playlist_episodes(workers=workers)
+            if existing is None:
+                print("   ❌ Couldn't read the playlist, nothing was changed")
+                self.state.record_run(started, self.playlist_name, self.playlist_id, 0, None, False)
+                return False
+            existing_episodes = set(existing)
+        
+        all_episodes = self.collect_episodes(
+            podcasts, days, keep_latest, existing_episodes, workers, selection
+        )
+        
+        # Sync or append episodes (newest first for each show, but shows in order)
+        ok = True
+        writes = 0
+        if not keep_old:
+            print(f"\n🔄 Syncing {len(all_episodes)} episode(s) to playlist...")
+            episode_uris = [ep["uri"] for ep in all_episodes]
+            
+            with self.metrics.phase("sync"):
+                changes = self.sync_playlist(episode_uris, workers)
+            if changes is None:
+                ok, writes = False, None
+                print("   ❌ Failed to update some episodes")
+            elif changes["writes"]:
+                writes = changes["writes"]
+                print(f"   ✅ {changes['added']} added, {changes['removed']} removed, "
+                      f"{changes['moved']} moved")
+            else:
+                print("   ✅ Already up to date")
+        elif all_episodes:
             print(f"\n📥 Adding {len(all_episodes)} episode(s) to playlist...")
             episode_uris = [ep["uri"] for ep in all_episodes]
             
-            if self.add_episodes_to_playlist(episode_uris):
+            with self.metrics.phase("sync"):
+                added = self.add_episodes_to_playlist(episode_uris)
+            writes = -(-len(episode_uris) // 100)
+            if added:
                 print("   ✅ Episodes added!")
             else:
+                ok, writes = False, None
                 print("   ❌ Failed to add some episodes")
+        if resumed and writes is not None:
+            writes += resumed
         
-        # Update description
-        self.update_playlist_description()
+        # Update description, unless that would move the playlist off the
+        # snapshot a failed write was journaled against
+        if ok and not fast:
+            with self.metrics.phase("description"):
+                self.update_playlist_description()
+        
+        if fast:
+            with self.metrics.phase("fast_check"):
+                if ok:
+                    self.remember_fast_path(podcasts, fingerprint)
+                else:
+                    self.state.clear_fast_path(self.playlist_id)
         
         # Summary
         total_duration = sum(ep["duration_ms"] for ep in all_episodes) // 60000
@@ -555,7 +2238,723 @@ class SpotifyDailyPodcasts:
         print(f"✨ Playlist updated: {len(all_episodes)} new episodes ({total_duration} min)")
         print(f"🔗 Open in Spotify: https://open.spotify.com/playlist/{self.playlist_id}")
         
-        return True
+        self.state.record_run(
+            started, self.playlist_name, self.playlist_id, len(all_episodes),
+            writes, ok
+        )
+        return ok
+    
+    def plan_daily_playlist(self, days=1, keep_old=False, keep_latest=False, workers=1,
+                            podcasts=None, selection=None):
+        """Work out what update_daily_playlist would do, without writing.
+
+        Makes the same reads (served from the caches where possible) but
+        no writes: the playlist isn't created, an interrupted update
+        isn't resumed and the cover and description are left alone.
+        Returns a JSON-serialisable dict of the episodes to add and
+        remove, the requests an update would still send, and request
+        counts; or, if the playlist couldn't be read, one with an "error"
+        and the reads made.
+        """
+        if podcasts is None:
+            podcasts = PODCASTS
+        reads_before = self.metrics.summary()["requests"]
+        
+        print("🎧 Daily Podcast Playlist (plan only, nothing will be changed)")
+        print("=" * 50)
+        
+        print(f"\n📋 Playlist: {self.playlist_name}")
+        with self.metrics.phase("find_playlist"):
+            playlist_id = self.find_playlist()
+        
+        endpoint = f"/playlists/{playlist_id or '{new}'}"
+        calls = []
+        if not playlist_id:
+            print("   ➕ Doesn't exist yet, would be created")
+            calls.append({"method": "POST", "endpoint": "/users/{user_id}/playlists"})
+        
+        # An update first finishes what an interrupted one left behind
+        resume = []
+        if playlist_id:
+            journal, resumable = self.load_resumable_journal()
+            if resumable:
+                resume = journal["batches"][journal["done"]:]
+                print(f"   ⏯️  Would resume an interrupted update first ({len(resume)} batch(es))")
+            elif journal:
+                print("   ⚠️  An interrupted update would be dropped, the playlist changed since")
+        for method, body in resume:
+            calls.append({
+                "method": method, "endpoint": f"{endpoint}/tracks",
+                "episodes": len(body.get("uris") or body.get("tracks") or [None]), "resume": True
+            })
+        
+        if (PLAYLIST_COVER_IMAGE and os.path.exists(PLAYLIST_COVER_IMAGE)
+                and not (playlist_id and self.cover_is_current(PLAYLIST_COVER_IMAGE))):
+            calls.append({"method": "PUT", "endpoint": f"{endpoint}/images"})
+        
+        current = []
+        if playlist_id:
+            with self.metrics.phase("read_playlist"):
+                current = self.get_playlist_episodes(include_unavailable=True, workers=workers)
+            if current is None:
+                print("   ❌ Couldn't read the playlist, no plan made")
+                return {
+                    "playlist": self.playlist_name,
+                    "playlist_id": playlist_id,
+                    "error": "couldn't read the playlist",
+                    "calls": [],
+                    "requests": {
+                        "reads": self.metrics.summary()["requests"] - reads_before,
+                        "apply": 0,
+                        "writes": 0
+                    }
+                }
+            current = apply_write_batches(current, resume)
+        
+        existing_episodes = set(current) if keep_old else set()
+        all_episodes = self.collect_episodes(
+            podcasts, days, keep_latest, existing_episodes, workers, selection
+        )
+        target = [ep["uri"] for ep in all_episodes]
+        
+        def post_calls(uris):
+            return [
+                {"method": "POST", "endpoint": f"{endpoint}/tracks", "episodes": len(uris[i:i+100])}
+                for i in range(0, len(uris), 100)
+            ]
+        
+        moved = 0
+        if keep_old:
+            mode = "append"
+            add, remove = target, []
+            calls.extend(post_calls(target))
+        else:
+            wanted, present = set(target), set(current)
+            add = [uri for uri in dict.fromkeys(target) if uri not in present]
+            remove = [uri for uri in dict.fromkeys(current) if uri and uri not in wanted]
+            # sync_playlist reads the snapshot and the playlist again
+            calls.append({"method": "GET", "endpoint": endpoint})
+            calls.append({"method": "GET", "endpoint": f"{endpoint}/tracks"})
+            
+            plan = choose_sync_plan(current, target)
+            if plan is None:
+                mode = "replace"
+                calls.append({"method": "PUT", "endpoint": f"{endpoint}/tracks", "episodes": len(target[:100])})
+                calls.extend(post_calls(target[100:]))
+            else:
+                mode = "sync"
+                moved = len(plan["move"])
+                for batch in plan["remove"]:
+                    calls.append({"method": "DELETE", "endpoint": f"{endpoint}/tracks", "episodes": len(batch)})
+                for _ in plan["move"]:
+                    calls.append({"method": "PUT", "endpoint": f"{endpoint}/tracks", "episodes": 1})
+                for _, batch in plan["add"]:
+                    calls.append({"method": "POST", "endpoint": f"{endpoint}/tracks", "episodes": len(batch)})
+        
+        calls.append({"method": "PUT", "endpoint": endpoint})
+        
+        reads = self.metrics.summary()["requests"] - reads_before
+        writes = sum(1 for call in calls if call["method"] != "GET")
+        
+        print(f"\n{'=' * 50}")
+        print(f"📝 Plan ({mode}): {len(add)} to add, {len(remove)} to remove, {moved} to move")
+        if None in current and not keep_old:
+            print(f"   ⚠️  {current.count(None)} unavailable item(s) would be removed")
+        print(f"   📡 {reads} read(s) made for this plan, {len(calls)} more request(s) "
+              f"to apply it ({writes} write(s))")
+        for call in calls:
+            count = f" ({call['episodes']} episode(s))" if "episodes" in call else ""
+            resumed = ", resumed" if call.get("resume") else ""
+            print(f"      {call['method']:<6} {call['endpoint']}{count}{resumed}")
+        
+        return {
+            "playlist": self.playlist_name,
+            "playlist_id": playlist_id,
+            "create": not playlist_id,
+            "mode": mode,
+            "episodes": len(target),
+            "add": add,
+            "remove": remove,
+            "move": moved,
+            "unavailable": current.count(None),
+            "calls": calls,
+            "requests": {"reads": reads, "apply": len(calls), "writes": writes}
+        }
+    
+    def fetch_profile_shows(self, playlists, workers=1):
+        """Fetch every unique show in a profile once, filling the episode cache.
+
+        Each show is fetched as far back as the widest window of the
+        playlists including it, so the playlists themselves only reuse
+        pages (see fetched_show_pages).
+        """
+        shows = {}
+        for entry in playlists:
+            for podcast in entry["podcasts"]:
+                _, days, keep_latest = shows.get(podcast["show_id"], (podcast, 0, False))
+                shows[podcast["show_id"]] = (
+                    podcast, max(days, entry["days"]), keep_latest or entry["keep_latest"]
+                )
+        
+        groups = {}
+        for podcast, days, keep_latest in shows.values():
+            groups.setdefault((days, keep_latest), []).append(podcast)
+        with self.metrics.phase("fetch_episodes"):
+            for (days, keep_latest), podcasts in groups.items():
+                self.fetch_podcast_episodes(podcasts, days, keep_latest, workers)
+    
+    def plan_profile(self, playlists, workers=1):
+        """Plan every playlist in a profile.
+
+        Returns the list of plans and the number of reads the up-front
+        show fetch made for all of them.
+        """
+        reads_before = self.metrics.summary()["requests"]
+        self.fetch_profile_shows(playlists, workers)
+        shared_reads = self.metrics.summary()["requests"] - reads_before
+        print(f"📡 {shared_reads} read(s) to fetch the profile's shows for every playlist")
+        
+        plans = []
+        for entry in playlists:
+            self.playlist_name = entry["name"]
+            self.playlist_id = None
+            print()
+            plans.append(self.plan_daily_playlist(
+                days=entry["days"],
+                keep_old=entry["keep_old"],
+                keep_latest=entry["keep_latest"],
+                workers=workers,
+                podcasts=entry["podcasts"],
+                selection=entry.get("selection")
+            ))
+        return plans, shared_reads
+    
+    def update_profile(self, playlists, workers=1, fast=False):
+        """Update every playlist in a profile in one run.
+
+        Each unique show is fetched once up front and shared by all the
+        playlists that include it. With fast, nothing is fetched up
+        front, since most playlists are expected to be unchanged; shows
+        are still fetched at most once per run.
+        """
+        if not fast:
+            self.fetch_profile_shows(playlists, workers)
+        
+        success = True
+        for entry in playlists:
+            self.playlist_name = entry["name"]
+            self.playlist_id = None
+            print()
+            success &= self.update_daily_playlist(
+                days=entry["days"],
+                keep_old=entry["keep_old"],
+                keep_latest=entry["keep_latest"],
+                workers=workers,
+                podcasts=entry["podcasts"],
+                selection=entry.get("selection"),
+                fast=fast
+            )
+        return success
+    
+    def refresh_if_expiring(self):
+        """Refresh the access token if it expires within TOKEN_REFRESH_MARGIN."""
+        if time.time() < self.token_expiry - TOKEN_REFRESH_MARGIN:
+            return True
+        if self.refresh_access_token():
+            return True
+        print("   ⚠️  Couldn't refresh the access token")
+        return False
+    
+    def run_daemon(self, playlists, workers=1, metrics_out=None, fast=False):
+        """Keep running, updating each playlist on its cron schedule.
+
+        Connections, the episode cache and the playlist index stay warm
+        between updates, and the access token is refreshed in the
+        background before it expires. Playlists that are due at the same minute are
+        updated together so shared shows are fetched once. Runs until
+        interrupted.
+        """
+        jobs = [(CronSchedule(entry["schedule"]), entry) for entry in playlists]
+        self.start_token_refresher()
+        now = datetime.now()
+        due = [schedule.next_after(now) for schedule, _ in jobs]
+        
+        print(f"⏰ Daemon started with {len(jobs)} playlist(s)")
+        for (schedule, entry), when in zip(jobs, due):
+            print(f"   {entry['name']}: '{schedule.expression}', next at {when:%Y-%m-%d %H:%M}")
+        
+        try:
+            while True:
+                now = datetime.now()
+                if now < min(due):
+                    # Wake at least every minute in case the clock jumps
+                    time.sleep(max(min((min(due) - now).total_seconds(), 60), 1))
+                    continue
+                
+                ready = [entry for (_, entry), when in zip(jobs, due) if when <= now]
+                self.refresh_if_expiring()
+                self.metrics = RunMetrics()
+                self.fresh_shows = set()
+                self.show_pages = {}
+                try:
+                    self.update_profile(ready, workers=workers, fast=fast)
+                except Exception as e:
+                    print(f"\n❌ Update failed: {e}")
+                if metrics_out:
+                    self.metrics.write(metrics_out)
+                
+                now = datetime.now()
+                due = [schedule.next_after(max(when, now)) if when <= now else when
+                       for (schedule, _), when in zip(jobs, due)]
+                print(f"\n⏰ Next update at {min(due):%Y-%m-%d %H:%M}")
+        except KeyboardInterrupt:
+            print("\n👋 Daemon stopped")
+
+
+class AsyncSpotifyDailyPodcasts:
+    """Asyncio engine for the request-heavy parts of an update.
+
+    Wraps a SpotifyDailyPodcasts instance and shares its token, episode
+    cache, metrics and rate limiter, but sends requests through one
+    httpx.AsyncClient so show fetches and playlist reads overlap on a
+    single event loop. At most `concurrency` requests are in flight.
+    Playlist writes stay on the journaled write_batches path. Requires
+    httpx.
+
+    Usage:
+        async with AsyncSpotifyDailyPodcasts(spotify) as engine:
+            results = await engine.fetch_podcast_episodes(PODCASTS)
+
+    SpotifyDailyPodcasts.run_async keeps one engine and loop per client.
+    """
+    
+    def __init__(self, spotify, concurrency=ASYNC_CONCURRENCY):
+        self.spotify = spotify
+        self.concurrency = concurrency
+        self.semaphore = None
+        self.client = None
+    
+    async def __aenter__(self):
+        import asyncio
+        
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError("The async engine needs httpx: pip install httpx") from None
+        
+        self.httpx = httpx
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        connect_timeout, read_timeout = self.spotify.timeout
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency
+            )
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+    
+    async def api_request(self, method, endpoint, idempotent=True, **kwargs):
+        """Make an authenticated API request, retrying 429s and 5xx.
+
+        As in SpotifyDailyPodcasts.request, requests that mustn't be
+        applied twice are only retried on 429s and failures to connect.
+        """
+        import asyncio
+        
+        url = f"{API_BASE}{endpoint}"
+        headers = kwargs.pop("headers", None) or {}
+        max_retries = self.spotify.max_retries
+        start = time.perf_counter()
+        
+        for attempt in range(max_retries + 1):
+            # Looked up per request, as the client's limiter can be swapped (see run_tenants)
+            rate_limiter = self.spotify.rate_limiter
+            if rate_limiter:
+                await asyncio.sleep(rate_limiter.reserve())
+            headers["Authorization"] = f"Bearer {self.spotify.access_token}"
+            try:
+                async with self.semaphore:
+                    response = await self.client.request(method, url, headers=headers, **kwargs)
+            except self.httpx.HTTPError as e:
+                retryable = isinstance(
+                    e, self.httpx.TransportError if idempotent
+                    else (self.httpx.ConnectError, self.httpx.ConnectTimeout)
+                )
+                if retryable and attempt < max_retries:
+                    await asyncio.sleep(self.spotify.retry_delay(None, attempt))
+                    continue
+                self.spotify.metrics.record_request(
+                    method, url, "error", time.perf_counter() - start, 0, attempt
+                )
+                raise
+            
+            if response.status_code != 429 and (response.status_code < 500 or not idempotent):
+                break
+            if attempt == max_retries:
+                break
+            
+            delay = self.spotify.retry_delay(response, attempt)
+            if delay > HTTP_MAX_RETRY_WAIT:
+                break
+            await asyncio.sleep(delay)
+        
+        self.spotify.metrics.record_request(
+            method, url, response.status_code, time.perf_counter() - start,
+            len(response.content), attempt
+        )
+        return response
+    
+    async def get_show_episodes(self, show_id):
+        """Async get_show_episodes, sharing the same episode cache."""
+        episodes, headers = self.spotify.cached_show_episodes(show_id)
+        if episodes is not None:
+            return episodes
+        
+        response = await self.api_request(
+            "GET",
+            f"/shows/{show_id}/episodes",
+            params={"limit": EPISODE_FIRST_PAGE, "market": "US"},
+            headers=headers
+        )
+        return self.spotify.store_show_episodes(show_id, response)
+    
+    async def iter_show_episodes(self, show_id):
+        """Async iter_show_episodes: newest first, paging back lazily."""
+        episodes = await self.get_show_episodes(show_id)
+        if episodes is None:
+            return
+        
+        seen = set()
+        older, offset, has_more = self.spotify.fetched_show_pages(show_id)
+        for entry in episodes + older:
+            if entry["uri"] not in seen:
+                seen.add(entry["uri"])
+                yield entry
+        
+        while has_more:
+            response = await self.api_request(
+                "GET",
+                f"/shows/{show_id}/episodes",
+                params={"limit": EPISODE_PAGE_SIZE, "offset": offset, "market": "US"}
+            )
+            if response.status_code != 200:
+                return
+            
+            data = response.json()
+            page = [episode_entry(episode) for episode in data["items"] if episode]
+            has_more = bool(data["next"])
+            self.spotify.remember_show_page(show_id, offset, page, has_more)
+            for entry in page:
+                if entry["uri"] not in seen:
+                    seen.add(entry["uri"])
+                    yield entry
+            
+            offset += EPISODE_PAGE_SIZE
+    
+    async def get_recent_episodes(self, show_id, days=1, keep_latest=False):
+        """Async get_recent_episodes."""
+        cutoff = release_cutoff(days)
+        episodes = []
+        latest = None
+        
+        async for entry in self.iter_show_episodes(show_id):
+            try:
+                ep_date = release_date_key(entry["release_date"])
+            except ValueError:
+                continue
+            if latest is None or ep_date > latest[0]:
+                latest = (ep_date, entry)
+            if ep_date < cutoff:
+                break
+            episodes.append(entry)
+        
+        if not episodes and keep_latest and latest:
+            episodes.append(latest[1])
+        
+        return episodes
+    
+    async def get_show_totals(self, show_ids):
+        """Async get_show_totals, with all 50-show batches in flight together."""
+        import asyncio
+        
+        async def fetch(batch):
+            response = await self.api_request(
+                "GET", "/shows",
+                params={"ids": ",".join(batch), "market": "US"}
+            )
+            if response.status_code != 200:
+                return []
+            return [show for show in response.json()["shows"] if show]
+        
+        batches = [show_ids[i:i+50] for i in range(0, len(show_ids), 50)]
+        totals = {}
+        for shows in await asyncio.gather(*(fetch(batch) for batch in batches)):
+            for show in shows:
+                totals[show["id"]] = show["total_episodes"]
+        return totals
+    
+    async def fetch_podcast_episodes(self, podcasts, days=1, keep_latest=False):
+        """Async fetch_podcast_episodes: every show fetched concurrently.
+
+        Returns (podcast, episodes, error) tuples in podcast order.
+        """
+        import asyncio
+        
+        stale = self.spotify.stale_cached_shows([podcast["show_id"] for podcast in podcasts])
+        if len(stale) >= 2:
+            self.spotify.mark_unchanged_shows(await self.get_show_totals(stale))
+        
+        async def fetch(podcast):
+            try:
+                episodes = await self.get_recent_episodes(podcast["show_id"], days, keep_latest)
+                return podcast, episodes, None
+            except Exception as e:
+                return podcast, [], e
+        
+        results = await asyncio.gather(*(fetch(podcast) for podcast in podcasts))
+        self.spotify.save_episode_cache()
+        return list(results)
+    
+    async def get_playlist_episodes(self, playlist_id=None, include_unavailable=False):
+        """Async get_playlist_episodes: later pages are fetched concurrently.
+
+        Returns None if any page couldn't be read.
+        """
+        import asyncio
+        
+        playlist_id = playlist_id or self.spotify.playlist_id
+        if not playlist_id:
+            return []
+        
+        async def fetch_page(offset):
+            response = await self.api_request(
+                "GET",
+                f"/playlists/{playlist_id}/tracks",
+                params={
+                    "limit": 100,
+                    "offset": offset,
+                    "fields": "items(track(uri)),next,total"
+                }
+            )
+            if response.status_code != 200:
+                return None
+            return response.json()
+        
+        first = await fetch_page(0)
+        if first is None:
+            return None
+        
+        offsets = range(100, first["total"], 100) if first["next"] else []
+        pages = [first] + list(await asyncio.gather(*(fetch_page(offset) for offset in offsets)))
+        if None in pages:
+            return None
+        
+        episodes = []
+        for data in pages:
+            for item in data["items"]:
+                if item["track"]:
+                    episodes.append(item["track"]["uri"])
+                elif include_unavailable:
+                    episodes.append(None)
+        return episodes
+    
+
+def load_profile(path, days=1, keep_old=False, keep_latest=False, schedule=DEFAULT_SCHEDULE,
+                 selection=None):
+    """Load a profile file describing several playlists.
+
+    The file is JSON with a "playlists" list; each entry needs a "name"
+    and a "podcasts" list in the same format as PODCASTS, and may set
+    "days", "keep_old", "keep_latest", the selection options "order",
+    "per_show" and "max_minutes", and a cron "schedule" for daemon
+    mode. Missing options fall back to the given defaults. Returns None
+    if the file is missing or invalid.
+    """
+    selection = selection or {}
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        playlists = []
+        for entry in data["playlists"]:
+            order = entry.get("order", selection.get("order", "shows"))
+            if order not in EPISODE_ORDERS:
+                raise ValueError(f"order must be one of {', '.join(EPISODE_ORDERS)}")
+            per_show = entry.get("per_show", selection.get("per_show"))
+            max_minutes = entry.get("max_minutes", selection.get("max_minutes"))
+            for name, value in (("per_show", per_show), ("max_minutes", max_minutes)):
+                if value is not None and int(value) < 1:
+                    raise ValueError(f"{name} must be at least 1")
+            playlists.append({
+                "name": entry["name"],
+                "podcasts": [
+                    {"name": podcast.get("name", podcast["show_id"]), "show_id": podcast["show_id"]}
+                    for podcast in entry["podcasts"]
+                ],
+                "days": int(entry.get("days", days)),
+                "keep_old": bool(entry.get("keep_old", keep_old)),
+                "keep_latest": bool(entry.get("keep_latest", keep_latest)),
+                "selection": {
+                    "order": order,
+                    "per_show": int(per_show) if per_show is not None else None,
+                    "max_minutes": int(max_minutes) if max_minutes is not None else None
+                },
+                "schedule": CronSchedule(entry.get("schedule", schedule)).expression
+            })
+        return playlists
+    except FileNotFoundError:
+        print(f"\n❌ Profile not found: {path}")
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        print(f"\n❌ Invalid profile {path}: {e}")
+    return None
+
+
+def load_tenants(path, days=1, keep_old=False, keep_latest=False, schedule=DEFAULT_SCHEDULE,
+                 selection=None):
+    """Load a tenants file for batch mode.
+
+    The file is JSON with a "tenants" list. Each tenant needs a "name",
+    a "state" database path and a "profile" file (see load_profile), and
+    may set its own "client_id" and "client_secret" and a request "rate"
+    (per second) and "burst". Relative paths are resolved from the
+    tenants file's directory. Returns None if the file or any profile is
+    missing or invalid.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        base = Path(path).resolve().parent
+        tenants = []
+        for entry in data["tenants"]:
+            playlists = load_profile(
+                str(base / Path(entry["profile"]).expanduser()),
+                days, keep_old, keep_latest, schedule, selection
+            )
+            if playlists is None:
+                return None
+            tenants.append({
+                "name": entry["name"],
+                "state": str(base / Path(entry["state"]).expanduser()),
+                "playlists": playlists,
+                "client_id": entry.get("client_id"),
+                "client_secret": entry.get("client_secret"),
+                "rate": float(entry["rate"]) if entry.get("rate") else RATE_LIMIT,
+                "burst": int(entry.get("burst", RATE_LIMIT_BURST))
+            })
+        
+        names = [tenant["name"] for tenant in tenants]
+        if len(set(names)) != len(names):
+            raise ValueError("tenant names must be unique")
+        return tenants
+    except FileNotFoundError:
+        print(f"\n❌ Tenants file not found: {path}")
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        print(f"\n❌ Invalid tenants file {path}: {e}")
+    return None
+
+
+def tenant_client(tenant, workers=1):
+    """Create a client with a tenant's credentials, state and rate budget."""
+    return SpotifyDailyPodcasts(
+        playlist_name=tenant["playlists"][0]["name"],
+        pool_size=max(HTTP_POOL_SIZE, workers),
+        client_id=tenant["client_id"],
+        client_secret=tenant["client_secret"],
+        state_path=tenant["state"],
+        rate_limit=tenant["rate"],
+        rate_burst=tenant["burst"]
+    )
+
+
+def run_tenants(tenants, workers=1, concurrency=TENANT_CONCURRENCY, use_async=False,
+                metrics=None, fast=False):
+    """Update every tenant's playlists, several tenants at a time.
+
+    Each tenant keeps its own token, state database and request rate.
+    Show episodes aren't user-specific, so every unique show is fetched
+    once up front and all tenants read it from one shared cache: API
+    calls grow with the number of shows, not tenants times shows. That
+    shared fetch is paced by RATE_LIMIT rather than any one tenant's
+    rate, and each tenant's state database only keeps its own shows.
+    Each tenant's output is printed in one block when it finishes. With
+    fast, shows are only fetched for playlists that changed (see
+    update_profile). Returns True if every tenant was updated.
+    """
+    metrics = metrics or RunMetrics()
+    clients = []
+    for tenant in tenants:
+        spotify = tenant_client(tenant, workers)
+        spotify.use_async = use_async
+        spotify.metrics = metrics
+        if not spotify.ensure_authenticated(interactive=False):
+            print(f"❌ {tenant['name']}: no usable token, skipping "
+                  f"(authorize with --authorize {tenant['name']})")
+            continue
+        spotify.start_token_refresher()
+        spotify.own_shows = {
+            podcast["show_id"] for entry in tenant["playlists"] for podcast in entry["podcasts"]
+        }
+        clients.append((tenant, spotify))
+    
+    if not clients:
+        return False
+    
+    # The first tenant's token fetches for everyone, on a budget of its own
+    shared = clients[0][1]
+    for _, spotify in clients[1:]:
+        spotify.share_episode_cache(shared)
+    if not fast:
+        show_count = len({
+            podcast["show_id"]
+            for tenant, _ in clients for entry in tenant["playlists"] for podcast in entry["podcasts"]
+        })
+        print(f"📡 Fetching {show_count} unique show(s) for {len(clients)} tenant(s)...")
+        tenant_limiter = shared.rate_limiter
+        shared.rate_limiter = TokenBucket(RATE_LIMIT, RATE_LIMIT_BURST) if RATE_LIMIT else None
+        try:
+            shared.fetch_profile_shows(
+                [entry for tenant, _ in clients for entry in tenant["playlists"]], workers
+            )
+        finally:
+            shared.rate_limiter = tenant_limiter
+    
+    output = ThreadOutput(sys.stdout)
+    
+    def run(client):
+        tenant, spotify = client
+        with output.capture():
+            print(f"\n👤 {tenant['name']}")
+            try:
+                return spotify.update_profile(tenant["playlists"], workers=workers, fast=fast)
+            except Exception as e:
+                print(f"\n❌ Update failed: {e}")
+                return False
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(run, clients))
+    finally:
+        sys.stdout = output.stream
+        for _, spotify in clients:
+            spotify.close_async()
+    
+    updated = sum(1 for ok in results if ok)
+    print(f"\n👥 {updated} of {len(tenants)} tenant(s) updated")
+    return updated == len(tenants)
+
+
+def positive_int(value):
+    """argparse type for options that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 
 def main():
@@ -578,21 +2977,209 @@ def main():
         action="store_true",
         help="Always include each show's most recent episode, even if it's older than the time window"
     )
+    parser.add_argument(
+        "--order",
+        choices=EPISODE_ORDERS,
+        default="shows",
+        help="Queue episodes in podcast list order or newest first across shows (default: shows)"
+    )
+    parser.add_argument(
+        "--per-show",
+        type=positive_int,
+        help="Take at most N episodes from each show"
+    )
+    parser.add_argument(
+        "--max-minutes",
+        type=positive_int,
+        help="Only queue episodes that fit in a total of N minutes"
+    )
     parser.add_argument(
         "--playlist", "-p",
         type=str,
         default="Daily Podcasts",
         help="Playlist name (default: 'Daily Podcasts')"
     )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        help="JSON file defining several playlists to update in one run"
+    )
+    parser.add_argument(
+        "--tenants",
+        type=str,
+        help="JSON file listing several accounts (tenants) to update in one batch"
+    )
+    parser.add_argument(
+        "--authorize",
+        type=str,
+        metavar="NAME",
+        help="With --tenants, authorize the named tenant's Spotify account and exit"
+    )
+    parser.add_argument(
+        "--metrics-out",
+        type=str,
+        help="Write request/phase metrics to FILE (Prometheus format for *.prom, "
+             "JSON otherwise, '-' for stdout)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and update playlists on their cron schedules"
+    )
+    parser.add_argument(
+        "--schedule",
+        type=str,
+        default=DEFAULT_SCHEDULE,
+        help=f"Cron expression for --daemon (default: '{DEFAULT_SCHEDULE}'); "
+             "profile playlists can set their own"
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Stop after a couple of cheap checks when nothing changed since the last "
+             "--fast run, and don't rewrite the description"
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Show the episodes and requests an update would make, without writing"
+    )
+    parser.add_argument(
+        "--plan-out",
+        type=str,
+        help="Like --plan, and write the plan as JSON to FILE ('-' for stdout)"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Fetch up to N shows or playlist pages concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch shows and playlist pages with asyncio and httpx instead of threads"
+    )
     
     args = parser.parse_args()
+    plan_only = args.plan or bool(args.plan_out)
+    
+    if plan_only and args.daemon:
+        print("\n❌ --plan can't be combined with --daemon")
+        sys.exit(1)
+    
+    if args.use_async:
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            print("\n❌ --async needs httpx: pip install httpx")
+            sys.exit(1)
+    
+    selection = {
+        "order": args.order,
+        "per_show": args.per_show,
+        "max_minutes": args.max_minutes
+    }
+    
+    if args.tenants:
+        if args.profile or args.daemon or plan_only:
+            print("\n❌ --tenants can't be combined with --profile, --daemon or --plan")
+            sys.exit(1)
+        tenants = load_tenants(
+            args.tenants, args.days, args.keep_old, args.keep_latest, args.schedule, selection
+        )
+        if not tenants:
+            sys.exit(1)
+        
+        if args.authorize:
+            tenant = next((t for t in tenants if t["name"] == args.authorize), None)
+            if not tenant:
+                print(f"\n❌ No tenant named {args.authorize!r} in {args.tenants}")
+                sys.exit(1)
+            sys.exit(0 if tenant_client(tenant).ensure_authenticated() else 1)
+        
+        metrics = RunMetrics()
+        ok = run_tenants(
+            tenants, workers=args.workers, use_async=args.use_async, metrics=metrics,
+            fast=args.fast
+        )
+        if args.metrics_out:
+            metrics.write(args.metrics_out)
+        sys.exit(0 if ok else 1)
+    
+    playlists = None
+    if args.profile:
+        playlists = load_profile(
+            args.profile, args.days, args.keep_old, args.keep_latest, args.schedule, selection
+        )
+        if not playlists:
+            sys.exit(1)
+    else:
+        try:
+            CronSchedule(args.schedule)
+        except ValueError as e:
+            print(f"\n❌ Invalid --schedule: {e}")
+            sys.exit(1)
     
-    spotify = SpotifyDailyPodcasts(playlist_name=args.playlist)
+    spotify = SpotifyDailyPodcasts(
+        playlist_name=args.playlist,
+        pool_size=max(HTTP_POOL_SIZE, args.workers)
+    )
+    spotify.use_async = args.use_async
     
-    if not spotify.ensure_authenticated():
+    with spotify.metrics.phase("auth"):
+        authenticated = spotify.ensure_authenticated()
+    if not authenticated:
         sys.exit(1)
+    spotify.start_token_refresher()
+    
+    try:
+        if args.daemon:
+            if not playlists:
+                playlists = [{
+                    "name": args.playlist,
+                    "podcasts": PODCASTS,
+                    "days": args.days,
+                    "keep_old": args.keep_old,
+                    "keep_latest": args.keep_latest,
+                    "selection": selection,
+                    "schedule": args.schedule
+                }]
+            spotify.run_daemon(
+                playlists, workers=args.workers, metrics_out=args.metrics_out, fast=args.fast
+            )
+            return
+        
+        if plan_only:
+            if playlists:
+                plans, shared_reads = spotify.plan_profile(playlists, workers=args.workers)
+            else:
+                plans, shared_reads = [spotify.plan_daily_playlist(
+                    days=args.days,
+                    keep_old=args.keep_old,
+                    keep_latest=args.keep_latest,
+                    workers=args.workers,
+                    selection=selection
+                )], 0
+            if args.plan_out:
+                write_plan(plans, args.plan_out, shared_reads)
+        elif playlists:
+            spotify.update_profile(playlists, workers=args.workers, fast=args.fast)
+        else:
+            spotify.update_daily_playlist(
+                days=args.days,
+                keep_old=args.keep_old,
+                keep_latest=args.keep_latest,
+                workers=args.workers,
+                selection=selection,
+                fast=args.fast
+            )
+    finally:
+        spotify.close_async()
     
-    spotify.update_daily_playlist(days=args.days, keep_old=args.keep_old, keep_latest=args.keep_latest)
+    if args.metrics_out:
+        spotify.metrics.write(args.metrics_out)
 
 
 if __name__ == "__main__":